@@ -0,0 +1,54 @@
+"""
+compare two benchmark result files and flag regressions
+
+usage: python benchmarks/compare.py baseline.json new.json [--threshold 0.1]
+exits 1 if any case got slower, or used more peak memory, by more than the
+threshold fraction
+"""
+
+import argparse
+import json
+import sys
+
+
+def compare(old, new, threshold=0.1):
+    """return a list of (case, metric, old, new, ratio) rows for shared cases"""
+    rows = []
+    for name in sorted(old.keys() & new.keys()):
+        for metric in ("time", "peak_bytes"):
+            before, after = old[name][metric], new[name][metric]
+            ratio = after / before if before else float("inf") if after else 1.0
+            rows.append((name, metric, before, after, ratio))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("baseline")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as fp:
+        old = json.load(fp)["results"]
+    with open(args.new) as fp:
+        new = json.load(fp)["results"]
+
+    regressions = 0
+    for name, metric, before, after, ratio in compare(old, new, args.threshold):
+        flag = ""
+        if ratio > 1 + args.threshold:
+            flag = "REGRESSION"
+            regressions += 1
+        elif ratio < 1 - args.threshold:
+            flag = "improved"
+        print(f"{name:40s} {metric:10s} {before:12.4g} {after:12.4g} {ratio:6.2f}x {flag}")
+
+    for name in sorted(old.keys() - new.keys()):
+        print(f"{name:40s} missing from {args.new}")
+    print(f"{regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
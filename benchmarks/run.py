@@ -0,0 +1,138 @@
+"""
+time the photompy hot paths on synthetic files and record peak memory
+
+usage: python benchmarks/run.py [--full] [--repeat N] [--out results.json]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from photompy import IESFile
+from photompy.plot import get_coords
+from synthetic import synthetic_ies, SYMMETRY_SPANS
+
+GRIDS = {
+    "small": (19, 9),  # 10 degree steps
+    "medium": (181, 73),  # 1 x 5 degree steps
+    "large": (361, 721),  # 0.5 degree steps
+}
+FULL_GRIDS = {"xlarge": (721, 1441)}  # 0.25 degree steps
+
+POINTS = [10**6]
+FULL_POINTS = [10**7, 10**8]
+CHUNK = 10**7  # evaluate very large point sets in chunks
+
+
+def measure(func, setup=lambda: None, repeat=5):
+    """best wall time over `repeat` runs, and peak traced memory of one run"""
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        func(state)
+        times.append(time.perf_counter() - start)
+    state = setup()
+    tracemalloc.start()
+    func(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"time": min(times), "peak_bytes": peak}
+
+
+def fresh(ies):
+    """setup that clears derived caches so each run recomputes them"""
+
+    def setup():
+        ies.photometry._cache.clear()
+        return ies
+
+    return setup
+
+
+def evaluate(phot, num):
+    rng = np.random.default_rng(0)
+    for start in range(0, num, CHUNK):
+        size = min(CHUNK, num - start)
+        phot.get_intensity(rng.uniform(0, 180, size), rng.uniform(0, 360, size))
+
+
+def cases(full=False):
+    grids = {**GRIDS, **(FULL_GRIDS if full else {})}
+    for size, (num_thetas, num_phis) in grids.items():
+        for sym in SYMMETRY_SPANS:
+            text = synthetic_ies(num_thetas, num_phis, sym).encode()
+            ies = IESFile.read(text)
+            name = f"{size}-{sym}"
+            yield f"read/{name}", lambda s, t=text: IESFile.read(t), None
+            yield f"write/{name}", lambda s: s.write(), lambda i=ies: i
+            yield f"expanded/{name}", lambda s: s.photometry.expanded(), fresh(ies)
+            yield (
+                f"interpolated/{name}",
+                lambda s: s.photometry.interpolated(181, 361),
+                fresh(ies),
+            )
+            yield f"total_optical_power/{name}", lambda s: s.photometry.total(), (
+                lambda i=ies: i
+            )
+        yield f"coords/{size}", lambda s: s.photometry.coords, fresh(ies)
+        yield (
+            f"photometric_coords/{size}",
+            lambda s: s.photometry.photometric_coords,
+            fresh(ies),
+        )
+        exp = ies.photometry.expanded()
+        yield (
+            f"get_coords/{size}",
+            lambda s, e=exp: get_coords(e.thetas, e.phis),
+            None,
+        )
+
+    ies = IESFile.read(synthetic_ies(*GRIDS["large"]).encode())
+    for num in POINTS + (FULL_POINTS if full else []):
+        yield (
+            f"get_intensity/{num:.0e}",
+            lambda s, n=num: evaluate(ies.photometry, n),
+            None,
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--full", action="store_true", help="include huge cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="only run matching cases")
+    parser.add_argument("--out", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, func, setup in cases(args.full):
+        if args.filter not in name:
+            continue
+        repeat = 1 if name.startswith("get_intensity") else args.repeat
+        results[name] = measure(func, setup or (lambda: None), repeat)
+        res = results[name]
+        print(
+            f"{name:40s} {res['time'] * 1e3:10.3f} ms "
+            f"{res['peak_bytes'] / 2**20:10.2f} MiB",
+            file=sys.stderr,
+        )
+
+    output = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as fp:
+            json.dump(output, fp, indent=1)
+    else:
+        print(json.dumps(output, indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+synthetic IES files for benchmarking
+"""
+
+import numpy as np
+from photompy.write import process_row
+
+SYMMETRY_SPANS = {"C0": 0, "C90": 90, "C180": 180, "C360": 360}
+
+
+def synthetic_values(thetas, phis):
+    """a smooth, asymmetric downlight-like distribution"""
+    t = np.radians(thetas)[None, :]
+    p = np.radians(phis)[:, None]
+    lobe = np.clip(np.cos(t), 0, None) ** 3
+    return 1000 * lobe * (1 + 0.3 * np.cos(2 * p) + 0.1 * np.cos(p)) + 5 * (t < 2)
+
+
+def synthetic_ies(num_thetas=181, num_phis=73, symmetry="C360"):
+    """
+    return the text of a type C IES file with evenly spaced angles.
+    `num_phis` is ignored for C0 files, which have a single horizontal angle.
+    """
+    span = SYMMETRY_SPANS[symmetry]
+    thetas = np.linspace(0, 180, num_thetas)
+    phis = np.linspace(0, span, 1 if span == 0 else num_phis)
+    values = synthetic_values(thetas, phis)
+
+    lines = [
+        "IESNA:LM-63-2002",
+        "[TEST] synthetic benchmark photometry",
+        "[MANUFAC] photompy",
+        "TILT=NONE",
+        f"1 -1 1 {len(thetas)} {len(phis)} 1 2 0.1 0.1 0",
+        "1 1 10",
+    ]
+    text = "\n".join(lines) + "\n"
+    text += process_row(thetas) + process_row(phis)
+    text += "".join(process_row(row) for row in values)
+    return text
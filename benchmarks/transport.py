@@ -0,0 +1,58 @@
+"""
+compare sending lamps to worker processes by pickling them against a
+SharedLampSet handle
+
+usage: python benchmarks/transport.py [--lamps N] [--jobs N]
+"""
+
+import argparse
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from photompy import IESFile, SharedLampSet
+from synthetic import synthetic_ies
+
+
+def _total_pickled(lamps):
+    return [float(ies.photometry.total()) for ies in lamps]
+
+
+def _total_shared(lamps, start, stop):
+    return [float(lamps[i].photometry.total()) for i in range(start, stop)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--lamps", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=4)
+    args = parser.parse_args()
+
+    text = synthetic_ies(181, 73)
+    lamps = [IESFile.read(text.encode()) for _ in range(args.lamps)]
+    bounds = [
+        (i * args.lamps // args.jobs, (i + 1) * args.lamps // args.jobs)
+        for i in range(args.jobs)
+    ]
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        pool.submit(int).result()  # start the workers
+
+        start = time.perf_counter()
+        chunks = [lamps[a:b] for a, b in bounds]
+        payload = sum(len(pickle.dumps(chunk)) for chunk in chunks)
+        list(pool.map(_total_pickled, chunks))
+        pickled = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with SharedLampSet(lamps) as shared:
+            handle = len(pickle.dumps(shared)) * args.jobs
+            list(pool.map(_total_shared, [shared] * args.jobs, *zip(*bounds)))
+        sharedtime = time.perf_counter() - start
+
+    print(f"{'transport':10s} {'seconds':>9s} {'bytes sent':>12s}")
+    print(f"{'pickle':10s} {pickled:9.3f} {payload:12d}")
+    print(f"{'shared':10s} {sharedtime:9.3f} {handle:12d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,9 @@ with open("README.md", "r") as fh:
             "numpy",
             "matplotlib",
         ],        
+        entry_points={
+            "console_scripts": ["photompy=photompy.cli:main"],
+        },
         classifiers=[
             "Programming Language :: Python :: 3",
             "Operating System :: OS Independent",
@@ -10,7 +10,16 @@ from .plot import (
 from .interpolate import get_intensity, interpolate_values
 from .calculate import total_optical_power, lamp_area
 from .ies import IESFile
-from .photometry import Photometry
+from .photometry import Photometry, set_default_dtype, get_default_dtype
+from .regrid import RegridOperator, regrid_operator
+from .harmonics import HarmonicPhotometry
+from .catalog import Catalog
+from .similarity import SimilarityIndex
+from .profiling import profile
+from .memory import memory_report
+from .shared import SharedLampSet
+from .archive import write_zip
+from .metrics import lamp_metrics, catalog_metrics
 
 __all__ = [
     "read_ies_data",
@@ -28,4 +37,17 @@ __all__ = [
     "lamp_area",
     "IESFile",
     "Photometry",
+    "set_default_dtype",
+    "get_default_dtype",
+    "RegridOperator",
+    "regrid_operator",
+    "HarmonicPhotometry",
+    "Catalog",
+    "SimilarityIndex",
+    "profile",
+    "memory_report",
+    "SharedLampSet",
+    "write_zip",
+    "lamp_metrics",
+    "catalog_metrics",
 ]
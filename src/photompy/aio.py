@@ -0,0 +1,82 @@
+"""
+asyncio support for the async methods of IESFile and Photometry.
+
+File reads run on the event loop's default executor. Parsing and numerical
+work run on a configurable executor, with at most `max_concurrency` jobs in
+flight per event loop. Large evaluations are split into chunks that each
+wait their turn, so one huge request can't starve the others and a
+cancelled request stops after the chunk in progress.
+
+    from photompy import aio
+    aio.configure(executor=ThreadPoolExecutor(8), max_concurrency=8)
+"""
+
+import asyncio
+import functools
+import os
+import weakref
+import numpy as np
+
+_config = {
+    "executor": None,  # None: the event loop's default executor
+    "max_concurrency": os.cpu_count() or 4,
+    "chunk_size": 2**16,  # points per evaluation job
+}
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def configure(executor=None, max_concurrency=None, chunk_size=None):
+    """
+    set the executor for CPU-heavy work, the number of jobs allowed in
+    flight per event loop, and the number of points evaluated per job.
+    arguments left as None keep their current value, except `executor`,
+    which None resets to the loop's default executor
+    """
+    _config["executor"] = executor
+    if max_concurrency is not None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        _config["max_concurrency"] = max_concurrency
+        _semaphores.clear()
+    if chunk_size is not None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        _config["chunk_size"] = chunk_size
+
+
+async def run(func, *args, **kwargs):
+    """run `func(*args, **kwargs)` on the configured executor"""
+    loop = asyncio.get_running_loop()
+    async with _semaphore(loop):
+        call = functools.partial(func, *args, **kwargs)
+        return await loop.run_in_executor(_config["executor"], call)
+
+
+async def run_io(func, *args):
+    """run blocking file i/o on the loop's default executor"""
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+async def evaluate(func, theta, phi, chunk_size=None):
+    """
+    evaluate `func(theta, phi)` over broadcast angle arrays, one executor
+    job per chunk of points. trailing (channel) axes of the result are kept
+    """
+    theta, phi = np.broadcast_arrays(np.asarray(theta), np.asarray(phi))
+    shape = theta.shape
+    theta, phi = theta.ravel(), phi.ravel()
+    step = chunk_size or _config["chunk_size"]
+    chunks = []
+    for start in range(0, max(theta.size, 1), step):
+        stop = start + step
+        chunks.append(await run(func, theta[start:stop], phi[start:stop]))
+    out = np.concatenate(chunks)
+    return out.reshape(shape + out.shape[1:])
+
+
+def _semaphore(loop):
+    try:
+        return _semaphores[loop]
+    except KeyError:
+        sem = _semaphores[loop] = asyncio.Semaphore(_config["max_concurrency"])
+        return sem
@@ -0,0 +1,113 @@
+"""
+Reading lamps from zip and tar archives without extracting them, and
+writing lamps into zip archives.
+
+Archive members are addressed as paths inside the archive, e.g.
+`catalog.zip/lamps/A.ies`; IESFile.read accepts such paths, and
+IESFile.read_many expands whole archives.
+"""
+
+from collections.abc import Mapping
+import pathlib
+import tarfile
+import zipfile
+
+ARCHIVE_SUFFIXES = (
+    ".zip",
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+)
+
+
+def is_archive(path):
+    """whether `path` names an existing zip or tar file"""
+    path = pathlib.Path(path)
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES) and path.is_file()
+
+
+def iter_members(path, suffixes=(".ies", ".ldt")):
+    """
+    yield (origin, bytes) for each archive member with one of the given
+    (case insensitive) suffixes, in archive order. origin is the member's
+    path inside the archive, e.g. catalog.zip/lamps/A.ies
+    """
+    path = pathlib.Path(path)
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if not info.is_dir() and _matches(info.filename, suffixes):
+                    yield path / info.filename, zf.read(info)
+    else:
+        with tarfile.open(path, "r:*") as tf:
+            for member in tf:  # streams through compressed tars
+                if member.isfile() and _matches(member.name, suffixes):
+                    yield path / member.name, tf.extractfile(member).read()
+
+
+def read_member(path):
+    """
+    return the bytes of an archive member addressed by its path inside the
+    archive, or None if no parent of `path` is an archive
+    """
+    path = pathlib.Path(path)
+    for parent in path.parents:
+        if is_archive(parent):
+            name = path.relative_to(parent).as_posix()
+            try:
+                if zipfile.is_zipfile(parent):
+                    with zipfile.ZipFile(parent) as zf:
+                        return zf.read(name)
+                with tarfile.open(parent, "r:*") as tf:
+                    return tf.extractfile(name).read()
+            except KeyError:
+                raise FileNotFoundError(f"{name} not found in {parent}") from None
+    return None
+
+
+def write_zip(path, files, which="orig", precision=2):
+    """
+    write IESFile objects into a zip archive, without temporary files.
+
+    files: mapping of member names to IESFile objects, or a sequence of
+        IESFile objects, named after the files they were read from.
+        members named .ldt are written as EULUMDAT, others as IES
+    which, precision: as for IESFile.write
+    """
+    if not isinstance(files, Mapping):
+        files = _member_names(files)
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, ies in files.items():
+            if name.lower().endswith(".ldt"):
+                zf.writestr(name, ies.write_ldt(which=which))
+            else:
+                zf.writestr(name, ies.write(which=which, precision=precision))
+
+
+def _matches(name, suffixes):
+    return pathlib.PurePosixPath(name).suffix.lower() in suffixes
+
+
+def _member_names(files):
+    """name lamps after their sources, keeping names and formats unique"""
+    named = {}
+    for i, ies in enumerate(files):
+        source = ies.source
+        if hasattr(source, "name") and not isinstance(source, pathlib.PurePath):
+            source = source.name  # file object
+        if isinstance(source, (str, pathlib.PurePath)):
+            source = pathlib.PurePath(source)
+            stem, suffix = source.stem, source.suffix.lower()
+        else:  # bytes, or no source
+            stem, suffix = f"lamp_{i:04d}", ".ies"
+        if suffix not in (".ies", ".ldt"):
+            suffix = ".ies"
+        name, n = f"{stem}{suffix}", 1
+        while name in named:
+            name, n = f"{stem}_{n}{suffix}", n + 1
+        named[name] = ies
+    return named
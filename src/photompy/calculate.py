@@ -1,8 +1,7 @@
 import numpy as np
 import pathlib
 import os
-from .interpolate import interpolate_values
-from .read import read_ies_data, verify_valdict
+from .read import verify_valdict
 
 
 def total_optical_power(data, num_thetas=181, num_phis=361, distance=1):
@@ -18,8 +17,8 @@ def total_optical_power(data, num_thetas=181, num_phis=361, distance=1):
     distance: lamp distance from sensor, in meters. Generally 1.
     """
     if isinstance(data, (str, pathlib.PosixPath)) and os.path.isfile(data):
-        valdict = _load_interpdict(data, num_thetas, num_phis)
-        result = _compute_total_power(valdict)
+        ies = _read_cached(data)
+        result = ies.photometry.interpolated(num_thetas, num_phis).total()
     elif isinstance(data, dict):
         verify_valdict(data)  # will raise errors if valdict is malformed
         result = _compute_total_power(data)
@@ -28,18 +27,14 @@ def total_optical_power(data, num_thetas=181, num_phis=361, distance=1):
     return result
 
 
-def _load_interpdict(filename, num_thetas, num_phis):
+def _read_cached(filename):
     """
-    load a dictionary with interpolated values, and
-    interpolate if it does not exist
+    parsed file shared by the legacy functions. imported here because the
+    ies module depends on this one
     """
-    lampdict = read_ies_data(filename)
-    try:
-        lampdict["interp_vals"]
-    except KeyError:
-        interpolate_values(lampdict, num_thetas=num_thetas, num_phis=num_phis)
+    from .ies import IESFile
 
-    return lampdict["interp_vals"]
+    return IESFile.read_cached(filename, strict=False)
 
 
 def _compute_total_power(valdict):
@@ -48,12 +43,8 @@ def _compute_total_power(valdict):
     phis = valdict["phis"]
     thetas = valdict["thetas"]
 
-    thetastep = thetas[1] - thetas[0]
-    thetasums = values.sum(axis=0) / len(phis)
-    thetas1 = np.maximum(0, thetas - thetastep / 2)  # Avoid negative angles
-    thetas2 = thetas + thetastep / 2
-    areas = compute_frustrum_area(thetas1, thetas2)
-    total_power = (thetasums * areas).sum()
+    thetasums = phi_band_weights(phis) @ values
+    total_power = (thetasums * theta_band_areas(thetas)).sum()
     return total_power
 
 
@@ -63,6 +54,41 @@ def compute_frustrum_area(theta1, theta2):
     return a2 - a1
 
 
+def theta_band_areas(thetas):
+    """
+    solid angle of the band around each vertical angle. bands reach midway
+    to the neighbouring angles, so non-uniform grids integrate correctly
+    """
+    lower, upper = _band_edges(thetas)
+    return compute_frustrum_area(np.maximum(0, lower), upper)  # Avoid negative angles
+
+
+def phi_band_weights(phis):
+    """
+    weights that average values over horizontal angles, in proportion to
+    the width of the band around each angle
+    """
+    lower, upper = _band_edges(phis)
+    widths = upper - lower
+    if widths.sum() <= 0:  # a single angle
+        return np.ones(len(widths)) / len(widths)
+    return widths / widths.sum()
+
+
+def _band_edges(angles):
+    """
+    edges of the band around each angle: midway to its neighbours, and
+    as far again beyond the first and last angles
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    if len(angles) < 2:
+        return angles, angles
+    mids = (angles[1:] + angles[:-1]) / 2
+    lower = np.concatenate(([2 * angles[0] - mids[0]], mids))
+    upper = np.concatenate((mids, [2 * angles[-1] - mids[-1]]))
+    return lower, upper
+
+
 def lamp_area(filename, units="meters", verbose=False):
     """
     return lamp area in units of m^2, ft^2 or in^2
@@ -72,19 +98,19 @@ def lamp_area(filename, units="meters", verbose=False):
         msg = "Argument units must be either `meters`,`feet`, or `inches"
         raise KeyError(msg)
 
-    lampdict = read_ies_data(filename)
-    if lampdict["units_type"] == 1:
+    header = _read_cached(filename).header
+    if header.units == 1:
         # feet
-        width_ft = lampdict["width"]
-        length_ft = lampdict["length"]
-        width_m = lampdict["width"] * 0.3048
-        length_m = lampdict["length"] * 0.3048
-    elif lampdict["units_type"] == 2:
+        width_ft = header.width
+        length_ft = header.length
+        width_m = header.width * 0.3048
+        length_m = header.length * 0.3048
+    elif header.units == 2:
         # meters
-        width_m = lampdict["width"]
-        length_m = lampdict["length"]
-        width_ft = lampdict["width"] / 0.3048
-        length_ft = lampdict["length"] / 0.3048
+        width_m = header.width
+        length_m = header.length
+        width_ft = header.width / 0.3048
+        length_ft = header.length / 0.3048
 
     width_in, length_in = width_ft * 12, length_ft * 12
 
@@ -0,0 +1,287 @@
+from dataclasses import dataclass
+import hashlib
+import math
+import os
+import pathlib
+import sqlite3
+from .ies import IESFile
+from .metrics import lamp_metrics
+from .photometry import LampSymmetry
+
+_HEADER_COLUMNS = {
+    "num_lamps": "INTEGER",
+    "lumens_per_lamp": "REAL",
+    "multiplier": "REAL",
+    "num_vert_angles": "INTEGER",
+    "num_horiz_angles": "INTEGER",
+    "photometric_type": "INTEGER",
+    "units": "INTEGER",
+    "width": "REAL",
+    "length": "REAL",
+    "height": "REAL",
+    "ballast_factor": "REAL",
+    "future_use": "REAL",
+    "input_watts": "REAL",
+}
+
+_METRIC_COLUMNS = {
+    "total_power": "REAL",
+    "max_value": "REAL",
+    "center_value": "REAL",
+    "symmetry": "TEXT",
+    "beam_angle": "REAL",
+    "field_angle": "REAL",
+    "efficacy": "REAL",
+}
+
+_COLUMNS = {"version": "TEXT", **_HEADER_COLUMNS, **_METRIC_COLUMNS}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    error TEXT,
+    {", ".join(f"{name} {kind}" for name, kind in _COLUMNS.items())}
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_files_hash ON files(hash);
+CREATE INDEX IF NOT EXISTS idx_files_lumens ON files(lumens_per_lamp);
+CREATE INDEX IF NOT EXISTS idx_files_watts ON files(input_watts);
+CREATE INDEX IF NOT EXISTS idx_files_power ON files(total_power);
+CREATE INDEX IF NOT EXISTS idx_files_symmetry ON files(symmetry);
+CREATE INDEX IF NOT EXISTS idx_keywords_path ON keywords(path);
+CREATE INDEX IF NOT EXISTS idx_keywords_key ON keywords(key, value);
+"""
+
+
+@dataclass
+class CatalogEntry:
+    """a file matched by a catalog query, with its indexed fields"""
+
+    path: pathlib.Path
+    fields: dict
+
+    def load(self, strict=True):
+        """parse the indexed file"""
+        return IESFile.read(self.path, strict=strict)
+
+
+class Catalog:
+    """
+    Persistent index of a library of IES files, stored in SQLite.
+
+    Header fields, keywords, and derived metrics (total power, max, center,
+    symmetry, beam and field angle, and efficacy) are stored per file, so
+    that a library can be searched without re-reading it. Re-indexing
+    only re-parses files whose mtime or size changed and whose content
+    hash no longer matches. Metrics that need an expanded photometry are
+    NULL for files that can't be expanded (type A/B, unknown symmetry).
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    def index(self, root, suffixes=(".ies", ".ldt"), strict=True):
+        """
+        index every file under `root` with one of the given (case
+        insensitive) suffixes, removing entries for files that no longer
+        exist. returns counts of added, updated, unchanged, removed and
+        failed files.
+        """
+        root = pathlib.Path(root).resolve()
+        prefix = str(root) + os.sep
+        report = dict.fromkeys(
+            ["added", "updated", "unchanged", "removed", "failed"], 0
+        )
+        known = {
+            row["path"]: row
+            for row in self._conn.execute(
+                "SELECT path, mtime, size, hash FROM files "
+                "WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+        }
+        seen = set()
+        with self._conn:
+            for file in sorted(root.rglob("*")):
+                if file.suffix.lower() not in suffixes or not file.is_file():
+                    continue
+                key = str(file)
+                seen.add(key)
+                stat = file.stat()
+                row = known.get(key)
+                if row is not None and (row["mtime"], row["size"]) == (
+                    stat.st_mtime,
+                    stat.st_size,
+                ):
+                    report["unchanged"] += 1
+                    continue
+
+                raw = file.read_bytes()
+                digest = hashlib.sha256(raw).hexdigest()
+                if row is not None and row["hash"] == digest:
+                    self._conn.execute(
+                        "UPDATE files SET mtime = ?, size = ? WHERE path = ?",
+                        (stat.st_mtime, stat.st_size, key),
+                    )
+                    report["unchanged"] += 1
+                    continue
+
+                ok = self._store(key, raw, digest, stat, strict)
+                if not ok:
+                    report["failed"] += 1
+                elif row is None:
+                    report["added"] += 1
+                else:
+                    report["updated"] += 1
+
+            for key in known.keys() - seen:
+                self._conn.execute("DELETE FROM files WHERE path = ?", (key,))
+                report["removed"] += 1
+        return report
+
+    def query(self, symmetry=None, keywords=None, **fields):
+        """
+        return entries matching all the given criteria, ordered by path.
+
+        symmetry: LampSymmetry or its string value
+        keywords: dict mapping keyword names to substrings their value
+            must contain
+        fields: indexed column names mapped to either an exact value or a
+            (min, max) tuple, where either bound may be None
+        """
+        clauses, params = ["error IS NULL"], []
+        if symmetry is not None:
+            clauses.append("symmetry = ?")
+            params.append(LampSymmetry(symmetry).value)
+        for name, criterion in fields.items():
+            if name not in _COLUMNS:
+                raise KeyError(f"{name} is not an indexed field")
+            if isinstance(criterion, tuple):
+                low, high = criterion
+                if low is not None:
+                    clauses.append(f"{name} >= ?")
+                    params.append(low)
+                if high is not None:
+                    clauses.append(f"{name} <= ?")
+                    params.append(high)
+            else:
+                clauses.append(f"{name} = ?")
+                params.append(criterion)
+        for key, value in (keywords or {}).items():
+            clauses.append(
+                "path IN (SELECT path FROM keywords WHERE key = ? AND value LIKE ?)"
+            )
+            params.extend([key, f"%{value}%"])
+
+        sql = f"SELECT * FROM files WHERE {' AND '.join(clauses)} ORDER BY path"
+        return [self._entry(row) for row in self._conn.execute(sql, params)]
+
+    def keywords(self, path):
+        """return the keywords stored for an indexed file"""
+        rows = self._conn.execute(
+            "SELECT key, value FROM keywords WHERE path = ?", (str(path),)
+        )
+        return {row["key"]: row["value"] for row in rows}
+
+    def failures(self):
+        """return a dict of files that could not be parsed and their errors"""
+        rows = self._conn.execute(
+            "SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path"
+        )
+        return {pathlib.Path(row["path"]): row["error"] for row in rows}
+
+    # ---------------- Internals -----------------------
+
+    def _migrate(self):
+        """add columns introduced since the catalog was created"""
+        rows = self._conn.execute("PRAGMA table_info(files)")
+        missing = _COLUMNS.keys() - {row["name"] for row in rows}
+        if not missing:
+            return
+        with self._conn:
+            for name in missing:
+                self._conn.execute(
+                    f"ALTER TABLE files ADD COLUMN {name} {_COLUMNS[name]}"
+                )
+            # the next index() re-parses every file to fill them in
+            self._conn.execute("UPDATE files SET mtime = -1, hash = ''")
+
+    def _store(self, key, raw, digest, stat, strict):
+        """parse and upsert one file. returns whether parsing succeeded"""
+        record = dict.fromkeys(_COLUMNS)
+        keywords = {}
+        try:
+            ies = IESFile.read(raw, strict=strict)
+            described = _describe(ies)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        else:
+            error = None
+            record.update(described)
+            keywords = ies.header.keywords
+
+        record.update(
+            path=key, mtime=stat.st_mtime, size=stat.st_size, hash=digest, error=error
+        )
+        names = ", ".join(record)
+        marks = ", ".join("?" * len(record))
+        self._conn.execute("DELETE FROM files WHERE path = ?", (key,))
+        self._conn.execute(
+            f"INSERT INTO files ({names}) VALUES ({marks})", list(record.values())
+        )
+        self._conn.executemany(
+            "INSERT INTO keywords (path, key, value) VALUES (?, ?, ?)",
+            [(key, k, v) for k, v in keywords.items()],
+        )
+        return error is None
+
+    @staticmethod
+    def _entry(row):
+        fields = {name: row[name] for name in _COLUMNS}
+        fields["hash"] = row["hash"]
+        return CatalogEntry(path=pathlib.Path(row["path"]), fields=fields)
+
+
+def _describe(ies):
+    """indexed column values for a parsed file"""
+    header, phot = ies.header, ies.photometry
+    record = {name: getattr(header, name) for name in _HEADER_COLUMNS}
+    record["photometric_type"] = int(header.photometric_type)
+    record["units"] = int(header.units)
+    record["version"] = str(header.version)
+    record["total_power"] = float(phot.total())
+    record["max_value"] = float(phot.max())
+    record["center_value"] = float(phot.center())
+    record["symmetry"] = phot.symmetry.value
+    try:
+        metrics = lamp_metrics(ies)
+    except NotImplementedError:  # type A/B, or unknown symmetry: not expandable
+        metrics = {}
+    for name in ("beam_angle", "field_angle", "efficacy"):
+        value = metrics.get(name, math.nan)
+        record[name] = None if math.isnan(value) else value
+    return record
@@ -0,0 +1,268 @@
+"""
+photompy command-line tool
+
+Every subcommand accepts many files or glob patterns, processes them on a
+pool of `--jobs` workers, and writes one JSON object per file to stdout as
+soon as it is done. Progress goes to stderr. The exit status is 1 if any
+file failed.
+
+`serve` instead loads the files once and answers queries over HTTP (see
+photompy.server).
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import glob
+import json
+import pathlib
+import sys
+import warnings
+from .ies import IESFile
+
+
+def main(argv=None):
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    files = _expand(args.files)
+    if not files:
+        parser.error("no input files found")
+    if args.command == "serve":
+        from .server import serve
+
+        serve(
+            files,
+            strict=not args.lenient,
+            host=args.host,
+            port=args.port,
+            unix_path=args.unix,
+            window=args.window / 1e3,
+        )
+        return 0
+    options = {
+        key: val
+        for key, val in vars(args).items()
+        if key not in ("files", "jobs", "quiet")
+    }
+    failed = 0
+    for done, result in enumerate(_run_all(files, options, args.jobs), start=1):
+        print(json.dumps(result), flush=True)
+        failed += not result["ok"]
+        if not args.quiet:
+            status = "ok" if result["ok"] else "FAILED"
+            print(f"[{done}/{len(files)}] {status} {result['file']}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+# ---------------- Subcommands -----------------------
+
+
+def info(ies, path, options):
+    header, phot = ies.header, ies.photometry
+    return {
+        "version": str(header.version),
+        "photometric_type": header.photometric_type.name,
+        "symmetry": phot.symmetry.value,
+        "num_vert_angles": header.num_vert_angles,
+        "num_horiz_angles": header.num_horiz_angles,
+        "lumens_per_lamp": header.lumens_per_lamp,
+        "input_watts": header.input_watts,
+        "total_power": float(phot.total()),
+        "max": float(phot.max()),
+        "center": float(phot.center()),
+        "fingerprint": ies.fingerprint,
+    }
+
+
+def validate(ies, path, options):
+    return {"symmetry": ies.photometry.symmetry.value}
+
+
+def scale(ies, path, options):
+    if options["to_total"] is not None:
+        ies.scale_to_total(options["to_total"])
+    elif options["to_max"] is not None:
+        ies.scale_to_max(options["to_max"])
+    elif options["to_center"] is not None:
+        ies.scale_to_center(options["to_center"])
+    else:
+        ies.scale(options["by"])
+    return _write(ies, path, options, which="orig")
+
+
+def interpolate(ies, path, options):
+    return _write(ies, path, options, which="interp")
+
+
+def convert(ies, path, options):
+    if options["format"] == "ldt":
+        out = _output_path(path, options, suffix=".ldt")
+        ies.write_ldt(
+            out,
+            which=options["which"],
+            interp_args=(options["thetas"], options["phis"]),
+        )
+        return {"output": str(out)}
+    return _write(ies, path, options, which=options["which"])
+
+
+def plot(ies, path, options):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = ies.plot(plot_type=options["type"], which=options["which"])
+    out = _output_path(path, options, suffix="." + options["format"])
+    fig.savefig(out)
+    plt.close(fig)
+    return {"output": str(out)}
+
+
+# ---------------- Internals -----------------------
+
+
+def _run_all(files, options, jobs):
+    """yield per-file results as they complete"""
+    if jobs <= 1:
+        for file in files:
+            yield _run(file, options)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_run, file, options) for file in files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _run(file, options):
+    """run one subcommand on one file, capturing errors and warnings"""
+    result = {"file": str(file), "command": options["command"]}
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        try:
+            ies = IESFile.read(pathlib.Path(file), strict=not options["lenient"])
+            result.update(_COMMANDS[options["command"]](ies, file, options))
+        except Exception as e:
+            result.update(ok=False, error=f"{type(e).__name__}: {e}")
+        else:
+            result["ok"] = True
+    if caught:
+        result["warnings"] = [str(w.message) for w in caught]
+    return result
+
+
+def _write(ies, path, options, which):
+    out = _output_path(path, options, suffix=".ies")
+    ies.write(
+        out,
+        which=which,
+        interp_args=(options["thetas"], options["phis"]),
+        precision=options["precision"],
+    )
+    return {"output": str(out)}
+
+
+def _output_path(path, options, suffix):
+    path = pathlib.Path(path)
+    outdir = pathlib.Path(options["output_dir"] or path.parent)
+    outdir.mkdir(parents=True, exist_ok=True)
+    out = outdir / f"{path.stem}{options['suffix']}{suffix}"
+    if out.resolve() == path.resolve():
+        raise FileExistsError(f"refusing to overwrite input file {path}")
+    return out
+
+
+def _expand(patterns):
+    """expand glob patterns, keeping literal paths as they are"""
+    files = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            files.extend(sorted(glob.glob(pattern, recursive=True)))
+        else:
+            files.append(pattern)
+    return files
+
+
+_COMMANDS = {
+    "info": info,
+    "validate": validate,
+    "scale": scale,
+    "interpolate": interpolate,
+    "convert": convert,
+    "plot": plot,
+}
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(prog="photompy", description=__doc__.strip())
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("files", nargs="+", help="files or glob patterns")
+    common.add_argument("-j", "--jobs", type=int, default=1, help="worker processes")
+    common.add_argument(
+        "--lenient", action="store_true", help="warn instead of failing on bad headers"
+    )
+    common.add_argument("-q", "--quiet", action="store_true", help="no progress")
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument(
+        "-o", "--output-dir", help="output directory (default: next to input)"
+    )
+    output.add_argument("--precision", type=int, default=2, help="candela decimals")
+    output.add_argument("--thetas", type=int, default=181, help="interp thetas")
+    output.add_argument("--phis", type=int, default=361, help="interp phis")
+
+    sub.add_parser("info", parents=[common], help="summarize files")
+    sub.add_parser("validate", parents=[common], help="check that files parse")
+
+    p = sub.add_parser("scale", parents=[common, output], help="rescale files")
+    group = p.add_mutually_exclusive_group(required=True)
+    group.add_argument("--to-total", type=float, help="target total optical power")
+    group.add_argument("--to-max", type=float, help="target maximum value")
+    group.add_argument("--to-center", type=float, help="target center value")
+    group.add_argument("--by", type=float, help="scale factor")
+    p.set_defaults(suffix="_scaled")
+
+    p = sub.add_parser(
+        "interpolate", parents=[common, output], help="write interpolated files"
+    )
+    p.set_defaults(suffix="_interp")
+
+    p = sub.add_parser("convert", parents=[common, output], help="rewrite files")
+    p.add_argument(
+        "--which",
+        choices=["orig", "full", "interp", "compact"],
+        default="orig",
+        help="photometry to write",
+    )
+    p.add_argument("--format", choices=["ies", "ldt"], default="ies")
+    p.set_defaults(suffix="_converted")
+
+    p = sub.add_parser("plot", parents=[common], help="save plots of files")
+    p.add_argument("-o", "--output-dir", help="output directory")
+    p.add_argument("--type", choices=["polar", "cartesian"], default="polar")
+    p.add_argument("--which", choices=["orig", "full", "interp"], default="full")
+    p.add_argument("--format", default="png", help="image format")
+    p.set_defaults(suffix="")
+
+    p = sub.add_parser("serve", help="serve intensity queries over HTTP")
+    p.add_argument("files", nargs="+", help="files or glob patterns")
+    p.add_argument(
+        "--lenient", action="store_true", help="warn instead of failing on bad headers"
+    )
+    p.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    p.add_argument("--port", type=int, default=8765, help="port to listen on")
+    p.add_argument("--unix", help="listen on this Unix socket instead")
+    p.add_argument(
+        "--window", type=float, default=1.0, help="batching window in milliseconds"
+    )
+
+    for name, p in sub.choices.items():
+        if name == "serve":
+            continue
+        p.add_argument("--suffix", default=p.get_default("suffix") or "")
+    return parser
+
+
+if __name__ == "__main__":
+    sys.exit(main())
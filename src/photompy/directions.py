@@ -0,0 +1,80 @@
+"""
+Unit direction vectors for theta/phi grids.
+
+Directions depend only on the angle grid, not on the values, so they are
+computed once per grid and shared by every photometry on it, as regrid
+operators are. Coordinates scaled by intensity are then a single multiply:
+
+    table = direction_table(exp.thetas, exp.phis)
+    points = table.vectors * exp.values[..., None]
+"""
+
+import threading
+import numpy as np
+from .regrid import GridCache, grid_signature
+
+
+class DirectionTable:
+    """
+    sin/cos tables and unit direction vectors for a theta/phi grid.
+
+    vectors: array of shape (num_phis, num_thetas, 3), in the plotting
+        convention of Photometry.coords, where theta = 0 points along -z
+    sin_theta, cos_theta, sin_phi, cos_phi: 1d tables of the angles
+
+    All arrays are read-only, since tables are shared.
+    """
+
+    def __init__(self, thetas, phis):
+        self.thetas = np.array(thetas, dtype=np.float64)
+        self.phis = np.array(phis, dtype=np.float64)
+        theta_rad, phi_rad = np.radians(self.thetas), np.radians(self.phis)
+        self.sin_theta, self.cos_theta = np.sin(theta_rad), np.cos(theta_rad)
+        self.sin_phi, self.cos_phi = np.sin(phi_rad), np.cos(phi_rad)
+
+        vectors = np.empty((len(self.phis), len(self.thetas), 3))
+        vectors[..., 0] = self.sin_phi[:, None] * self.sin_theta
+        vectors[..., 1] = self.cos_phi[:, None] * self.sin_theta
+        vectors[..., 2] = -self.cos_theta
+        self.vectors = vectors
+        for arr in self._arrays():
+            arr.flags.writeable = False
+        self._flat = {}
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return sum(arr.nbytes for arr in self._arrays())
+
+    def flat(self, dtype=np.float64):
+        """vectors as an array of shape (num_phis * num_thetas, 3) in `dtype`"""
+        dtype = np.dtype(dtype)
+        with self._lock:
+            if dtype not in self._flat:
+                flat = self.vectors.reshape(-1, 3).astype(dtype, copy=False)
+                flat.flags.writeable = False
+                self._flat[dtype] = flat
+            return self._flat[dtype]
+
+    def _arrays(self):
+        return (
+            self.thetas,
+            self.phis,
+            self.sin_theta,
+            self.cos_theta,
+            self.sin_phi,
+            self.cos_phi,
+            self.vectors,
+        )
+
+
+_TABLES = GridCache(maxsize=16)
+
+
+def direction_table(thetas, phis):
+    """
+    return the DirectionTable for a theta/phi grid, reusing a previously
+    built table for the same grid if possible
+    """
+    key = grid_signature(thetas, phis)
+    return _TABLES.get_or_create(key, lambda: DirectionTable(thetas, phis))
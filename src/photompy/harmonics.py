@@ -0,0 +1,162 @@
+from dataclasses import dataclass
+import numpy as np
+from .calculate import compute_frustrum_area
+from .directions import direction_table
+from .photometry import Photometry, PhotometricType
+
+
+def num_coefficients(order):
+    """number of real spherical harmonics up to and including `order`"""
+    return (order + 1) ** 2
+
+
+def harmonic_basis(directions, order):
+    """
+    evaluate the real, orthonormal spherical harmonics up to `order` at
+    the given direction vectors.
+
+    directions: array of shape (..., 3), in the convention of
+        Photometry.to_cartesian (z points towards theta=0). Vectors need
+        not be normalized.
+    returns an array of shape (..., (order + 1) ** 2), where harmonic
+    (l, m) is at index l * (l + 1) + m
+    """
+    directions = np.asarray(directions, dtype=np.float64)
+    r = np.linalg.norm(directions, axis=-1)
+    if np.any(r == 0):
+        raise ValueError("direction vectors must be nonzero")
+    x, y, z = np.moveaxis(directions, -1, 0) / r
+    # sin(theta) * exp(i * phi), so that no trig calls are needed
+    u = y + 1j * x
+
+    basis = np.empty(x.shape + (num_coefficients(order),))
+    umm = np.ones_like(u)
+    cmm = np.sqrt(1 / (4 * np.pi))  # normalization of p_mm / sin^m
+    for m in range(order + 1):
+        if m > 0:
+            umm = umm * u
+            cmm = cmm * np.sqrt((2 * m + 1) / (2 * m))
+        # associated Legendre functions with the sin^m factor divided out
+        p1 = p2 = None
+        for l in range(m, order + 1):
+            if l == m:
+                p = np.full(x.shape, cmm)
+            elif l == m + 1:
+                p = np.sqrt(2 * m + 3) * z * p1
+            else:
+                a = np.sqrt((4 * l * l - 1) / (l * l - m * m))
+                b = np.sqrt(((l - 1) ** 2 - m * m) / (4 * (l - 1) ** 2 - 1))
+                p = a * (z * p1 - b * p2)
+            p2, p1 = p1, p
+            if m == 0:
+                basis[..., l * (l + 1)] = p
+            else:
+                basis[..., l * (l + 1) + m] = np.sqrt(2) * p * umm.real
+                basis[..., l * (l + 1) - m] = np.sqrt(2) * p * umm.imag
+    return basis
+
+
+@dataclass
+class HarmonicPhotometry:
+    """
+    Photometry stored as a truncated real spherical-harmonic expansion.
+
+    Suited to smooth distributions, where a few hundred coefficients can
+    stand in for the full value table. Coefficients have shape
+    ((order + 1) ** 2,) or ((order + 1) ** 2, num_channels).
+    """
+
+    order: int
+    coefficients: np.ndarray
+    photometric_type: PhotometricType = PhotometricType.C
+
+    @property
+    def nbytes(self):
+        return self.coefficients.nbytes
+
+    @classmethod
+    def fit(
+        cls,
+        photometry,
+        order=None,
+        max_rel_error=None,
+        max_order=20,
+        num_thetas=91,
+        num_phis=181,
+    ):
+        """
+        fit a photometry by weighted least squares over the sphere.
+
+        order: expansion order to fit. If not given and `max_rel_error` is,
+            the lowest order up to `max_order` whose maximum error on the
+            sample grid is within `max_rel_error` of the peak value is used.
+            Defaults to 8 if neither is given.
+        num_thetas, num_phis: size of the regular sample grid
+        """
+        if order is None and max_rel_error is None:
+            order = 8
+        top = max_order if order is None else order
+
+        thetas = np.linspace(0, 180, num_thetas)
+        phis = np.linspace(0, 360, num_phis)[:-1]  # 360 duplicates 0
+        samples = photometry.regridded(thetas, phis).values
+        samples = samples.reshape(len(phis) * len(thetas), -1)
+
+        # solid angle of the band around each sample
+        step = thetas[1] - thetas[0]
+        areas = compute_frustrum_area(
+            np.maximum(0, thetas - step / 2), np.minimum(180, thetas + step / 2)
+        )
+        weights = np.sqrt(np.tile(areas / len(phis), len(phis)))
+
+        # tables point theta = 0 along -z; to_cartesian along +z
+        dirs = direction_table(thetas, phis).flat() * [1, 1, -1]
+        basis = harmonic_basis(dirs, top)
+
+        # nested least squares: fits for every order up to `top` share one QR
+        q, r = np.linalg.qr(basis * weights[:, None])
+        qb = q.T @ (samples * weights[:, None])
+
+        orders = [top] if order is not None else range(top + 1)
+        peak = np.abs(samples).max()
+        for n in orders:
+            k = num_coefficients(n)
+            coeffs = np.linalg.solve(r[:k, :k], qb[:k])
+            if order is not None:
+                break
+            err = np.abs(basis[:, :k] @ coeffs - samples).max()
+            if err <= max_rel_error * peak:
+                break
+
+        if not photometry.is_multichannel:
+            coeffs = coeffs[:, 0]
+        return cls(
+            order=n,
+            coefficients=coeffs,
+            photometric_type=photometry.photometric_type,
+        )
+
+    def evaluate(self, directions):
+        """
+        evaluate the expansion at direction vectors of shape (..., 3), in
+        the convention of Photometry.to_cartesian
+        """
+        return harmonic_basis(directions, self.order) @ self.coefficients
+
+    def get_intensity(self, theta, phi):
+        """evaluate the expansion at vertical and horizontal angles"""
+        theta, phi = np.broadcast_arrays(theta, phi)
+        dirs = np.stack(Photometry.to_cartesian(theta, phi, 1), axis=-1)
+        return self.evaluate(dirs)
+
+    def to_photometry(self, thetas=None, phis=None):
+        """reconstruct the expansion onto a theta/phi grid"""
+        thetas = np.linspace(0, 180, 181) if thetas is None else np.asarray(thetas)
+        phis = np.linspace(0, 360, 361) if phis is None else np.asarray(phis)
+        tgrid, pgrid = np.meshgrid(thetas, phis)
+        return Photometry(
+            thetas=thetas,
+            phis=phis,
+            values=self.get_intensity(tgrid, pgrid),
+            photometric_type=self.photometric_type,
+        )
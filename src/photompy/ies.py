@@ -1,12 +1,25 @@
 from dataclasses import dataclass, asdict
+import hashlib
 import pathlib
+import sys
 import warnings
 import copy
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import functools
+from . import aio
 from .photometry import Photometry
 from .read import load_bytes, process_keywords, read_angles
+from .archive import is_archive, iter_members
+from .ldt import is_ldt, parse_ldt, format_ldt
 from .write import process_row
 from .exceptions import IESPathError, IESHeaderError  # , IESDecodeError,
 from .ies_header import IESHeader, IESVersion
+from .profiling import span
+from .regrid import GridCache
+
+# parsed files shared by the legacy functional api, keyed by path and stat
+_FILE_CACHE = GridCache(64)
 
 
 @dataclass
@@ -15,10 +28,13 @@ class IESFile:
     header: IESHeader
     photometry: Photometry
 
-    # TODO: fix this
     # attribute passthrough to header / photometry -------------
     def __getattr__(self, name):
-        # called only if normal attribute lookup fails
+        # called only if normal attribute lookup fails. dunder and field
+        # lookups on a partially constructed object (as during copying or
+        # unpickling) must not recurse into the passthrough
+        if name.startswith("__") or name in ("source", "header", "photometry"):
+            raise AttributeError(name)
         if hasattr(self.photometry, name):
             return getattr(self.photometry, name)
         if hasattr(self.header, name):
@@ -45,6 +61,34 @@ class IESFile:
 
         return new_obj
 
+    def __copy__(self):
+        return self.copy()
+
+    def copy(self):
+        """
+        return a cheap clone for trying out changes. The (immutable) header
+        is shared, and the photometry is cloned with Photometry.copy, so
+        arrays and caches are only duplicated once a clone is scaled.
+        """
+        return IESFile(
+            source=self.source, header=self.header, photometry=self.photometry.copy()
+        )
+
+    def astype(self, dtype):
+        """return a clone whose photometry stores its values in `dtype`"""
+        return IESFile(
+            source=self.source,
+            header=self.header,
+            photometry=self.photometry.astype(dtype),
+        )
+
+    def __reduce__(self):
+        # open file objects can't be pickled; keep their name instead
+        source = self.source
+        if not isinstance(source, (str, pathlib.PurePath, bytes, type(None))):
+            source = getattr(source, "name", None)
+        return (IESFile, (source, self.header, self.photometry))
+
     def __eq__(self, other):
         if self.header != other.header:
             return False
@@ -52,45 +96,194 @@ class IESFile:
             return False
         return True
 
+    def __hash__(self):
+        return hash(self.fingerprint)
+
+    @property
+    def fingerprint(self):
+        """stable digest of the header and photometry content"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.header.fingerprint.encode())
+        digest.update(self.photometry.fingerprint.encode())
+        return digest.hexdigest()
+
+    def memory_usage(self, deep=True):
+        """
+        return the bytes held by the header and photometry, as
+        {"header", "photometry": Photometry.memory_usage(), "total"}
+        """
+        header = sys.getsizeof(self.header) + sum(
+            sys.getsizeof(k) + sys.getsizeof(v) for k, v in self.header.keywords.items()
+        )
+        photometry = self.photometry.memory_usage(deep=deep)
+        return {
+            "header": header,
+            "photometry": photometry,
+            "total": header + photometry["total"],
+        }
+
+    def drop_caches(self, kind="all"):
+        """release derived photometry caches. see Photometry.drop_caches"""
+        return self.photometry.drop_caches(kind)
+
     def to_dict(self):
-        return asdict(self)
+        # dataclasses.asdict would also try to copy the photometry's caches
+        # and lock
+        phot = self.photometry
+        fields = (
+            "thetas",
+            "phis",
+            "values",
+            "photometric_type",
+            "symmetry",
+            "strict",
+            "dtype",
+        )
+        return {
+            "source": self.source,
+            "header": asdict(self.header),
+            "photometry": {name: copy.deepcopy(getattr(phot, name)) for name in fields},
+        }
 
     @classmethod
     def read(cls, src, strict=True):
-        """parse an ies file from any source"""
-        raw, origin = load_bytes(src)
-        if origin is not None:  # check filename
-            cls._check_filename(origin=origin, strict=strict)
+        """
+        parse an ies file, or a EULUMDAT (.ldt) file, from any source.
+        eulumdat is recognized by the file suffix, or by content for raw data
+        """
+        with span("read") as read_span:
+            with span("read.load"):
+                raw, origin = load_bytes(src)
+            read_span.add(bytes=len(raw))
+            if origin is None and is_ldt(raw) or (
+                origin is not None and origin.suffix.lower() == ".ldt"
+            ):
+                with span("read.ldt", bytes=len(raw)):
+                    hdr, phot = parse_ldt(raw, strict=strict)
+                return cls(source=src, header=hdr, photometry=phot)
+            if origin is not None:  # check filename
+                cls._check_filename(origin=origin, strict=strict)
 
-        string = raw.decode("utf-8")
+            with span("read.decode", bytes=len(raw)):
+                string = raw.decode("utf-8")
 
-        # TODO: tilt is currently in process_keywords, should be moved out separately
-        version, header, tilt, numeric, blocks = cls._split_string(string)
+            # TODO: tilt is currently in process_keywords, should be moved out separately
+            with span("read.split_string"):
+                version, header, tilt, numeric, blocks = cls._split_string(string)
 
-        version = IESVersion.from_token(version, strict=strict)
+            version = IESVersion.from_token(version, strict=strict)
 
-        hdr = IESHeader.from_tokens(
-            version=version,
-            keywords=process_keywords(header),
-            # tilt=tilt,
-            numeric=numeric,
-            strict=strict,
-        )
+            with span("read.process_keywords", lines=len(header)):
+                keywords = process_keywords(header)
 
-        thetas, phis, values = read_angles(
-            blocks, hdr.num_vert_angles, hdr.num_horiz_angles
-        )
-        phot = Photometry(
-            thetas=thetas,
-            phis=phis,
-            values=values * hdr.multiplier,
-            photometric_type=hdr.photometric_type,
-        )
+            with span("read.header"):
+                hdr = IESHeader.from_tokens(
+                    version=version,
+                    keywords=keywords,
+                    # tilt=tilt,
+                    numeric=numeric,
+                    strict=strict,
+                )
+
+            with span("read.read_angles", elements=len(blocks)):
+                thetas, phis, values = read_angles(
+                    blocks, hdr.num_vert_angles, hdr.num_horiz_angles
+                )
+            phot = Photometry(
+                thetas=thetas,
+                phis=phis,
+                values=values * hdr.multiplier,
+                photometric_type=hdr.photometric_type,
+            )
 
-        hdr = hdr.update(multiplier=1)  # reset
+            hdr = hdr.update(multiplier=1)  # reset
 
         return cls(source=src, header=hdr, photometry=phot)
 
+    @classmethod
+    def read_many(
+        cls,
+        sources,
+        strict=True,
+        jobs=1,
+        suffixes=(".ies", ".ldt"),
+        return_exceptions=False,
+    ):
+        """
+        parse many files, returning IESFile objects in order.
+
+        sources: paths, raw data, or zip/tar archives. archives are expanded
+            to their members with one of `suffixes`, read without extracting
+            them; the source of each lamp is its path inside the archive
+        jobs: worker processes to parse with
+        return_exceptions: give the exception for files that fail to parse
+            instead of raising the first one
+        """
+        items = []
+        for src in sources:
+            if isinstance(src, (str, pathlib.PurePath)) and is_archive(src):
+                members = iter_members(src, suffixes)
+                items.extend((raw, origin, origin) for origin, raw in members)
+            else:
+                raw, origin = load_bytes(src)
+                items.append((raw, origin, src))
+        for _, origin, _ in items:
+            if origin is not None:
+                cls._check_filename(origin=origin, strict=strict)
+
+        raws = [raw for raw, _, _ in items]
+        parse = functools.partial(_read_or_error, cls, strict=strict)
+        if jobs > 1 and len(raws) > 1:
+            chunksize = max(1, len(raws) // (4 * jobs))
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(parse, raws, chunksize=chunksize))
+        else:
+            results = [parse(raw) for raw in raws]
+
+        for result, (_, _, src) in zip(results, items):
+            if isinstance(result, Exception):
+                if not return_exceptions:
+                    raise result
+            else:
+                result.source = src
+        return results
+
+    @classmethod
+    async def aread(cls, src, strict=True):
+        """
+        async counterpart of `read`. the file is read without blocking the
+        event loop, and parsed on the executor configured in photompy.aio
+        """
+        raw, origin = await aio.run_io(load_bytes, src)
+        if origin is not None:
+            cls._check_filename(origin=origin, strict=strict)
+        ies = await aio.run(cls.read, raw, strict=strict)
+        ies.source = src
+        return ies
+
+    @classmethod
+    async def aread_many(cls, sources, strict=True, return_exceptions=False):
+        """
+        read many files concurrently, returning IESFile objects in the order
+        of `sources`. with return_exceptions=True, files that fail to parse
+        give their exception instead of cancelling the rest
+        """
+        reads = [cls.aread(src, strict=strict) for src in sources]
+        return await asyncio.gather(*reads, return_exceptions=return_exceptions)
+
+    @classmethod
+    def read_cached(cls, path, strict=True):
+        """
+        parse an ies file from a path, reusing the parsed object (and any
+        photometry it has since derived) while the file's mtime and size are
+        unchanged. The returned object is shared: use `.copy()` before
+        scaling or updating it.
+        """
+        path = pathlib.Path(path).resolve()
+        stat = path.stat()
+        key = (str(path), stat.st_mtime_ns, stat.st_size, strict)
+        return _FILE_CACHE.get_or_create(key, lambda: cls.read(path, strict=strict))
+
     @classmethod
     def from_photometry(cls, phot):
         return cls(source=None, header=IESHeader.from_photometry(phot), photometry=phot)
@@ -126,66 +319,101 @@ class IESFile:
     def write(
         self,
         filename=None,
-        which="orig",  # orig | full | interp
+        which="orig",  # orig | full | interp | compact
         interp_args=(181, 361),
         precision=2,
+        channel=None,
     ):
-        """write the selected photometry to a file, or return as bytes"""
+        """
+        write the selected photometry to a file, or return as bytes.
+        multi-channel photometry requires selecting a `channel` to write.
+        """
 
-        photometry = self._get_photometry(which, interp_args)
-        header = self.header.update(
-            num_vert_angles=len(photometry.thetas),
-            num_horiz_angles=len(photometry.phis),
-        )
-        # header
-        iesdata = header.to_string()
-        # thetas and phis
-        iesdata += process_row(photometry.thetas)
-        iesdata += process_row(photometry.phis)
-
-        # candela values
-        candelas = ""
-        for row in photometry.values:
-            candelas += process_row(row, sigfigs=precision)
-        iesdata += candelas
-
-        # write
-        if filename is not None:
-            with open(filename, "w", encoding="utf-8") as newfile:
-                newfile.write(iesdata)
-        else:
-            return iesdata.encode("utf-8")
+        with span("write") as write_span:
+            photometry = self._get_photometry(which, interp_args, channel)
+            header = self.header.update(
+                num_vert_angles=len(photometry.thetas),
+                num_horiz_angles=len(photometry.phis),
+            )
+            # header
+            with span("write.header"):
+                iesdata = header.to_string()
+            # thetas and phis
+            with span("write.angles"):
+                iesdata += process_row(photometry.thetas)
+                iesdata += process_row(photometry.phis)
+
+            # candela values
+            with span("write.values", elements=photometry.values.size):
+                candelas = ""
+                for row in photometry.values:
+                    candelas += process_row(row, sigfigs=precision)
+                iesdata += candelas
+            write_span.add(chars=len(iesdata))
+
+            # write
+            if filename is not None:
+                with span("write.output"):
+                    with open(filename, "w", encoding="utf-8") as newfile:
+                        newfile.write(iesdata)
+            else:
+                return iesdata.encode("utf-8")
+
+    def write_ldt(
+        self, filename=None, which="orig", interp_args=(181, 361), channel=None
+    ):
+        """
+        write the selected photometry as EULUMDAT to a file, or return as
+        bytes. see `write` for the arguments
+        """
+        with span("write_ldt"):
+            photometry = self._get_photometry(which, interp_args, channel)
+            text = format_ldt(self.header, photometry)
+            if filename is None:
+                return text.encode("latin-1", "replace")
+            with open(filename, "wb") as newfile:
+                newfile.write(text.encode("latin-1", "replace"))
 
     def plot(
         self,
         plot_type="polar",  # polar | cartesian
         which="full",  # orig | full | interp
         interp_args=(181, 361),  # (num_thetas, num_phis)
+        channel=None,
+        max_points=None,  # cartesian only; see Photometry.plot_cartesian
         **kwargs,
     ):
         """return a polar or 3d cartesian plot of the photometry"""
-        photometry = self._get_photometry(which, interp_args)
+        photometry = self._get_photometry(which, interp_args, channel)
         if plot_type.lower() == "polar":
             return photometry.plot_polar(**kwargs)
         elif plot_type.lower() == "cartesian":
-            return photometry.plot_cartesian(**kwargs)
+            return photometry.plot_cartesian(max_points=max_points, **kwargs)
         else:
             raise ValueError(f"unrecognized plot type {plot_type}")
 
     # ---------------- Internals -----------------------
-    def _get_photometry(self, which, interp_args=(181, 361)):
+    def _get_photometry(self, which, interp_args=(181, 361), channel=None):
+        photometry = self.photometry
+        if channel is not None:
+            photometry = photometry.channel(channel)
+        elif photometry.is_multichannel:
+            raise ValueError("multi-channel photometry requires a `channel`")
+
         if which.lower() == "orig":
-            return self.photometry
+            return photometry
         elif which.lower() == "full":
-            return self.photometry.expanded()
+            return photometry.expanded()
         elif which.lower() == "interp":
-            return self.photometry.interpolated(*interp_args)
+            return photometry.interpolated(*interp_args)
+        elif which.lower() == "compact":
+            return photometry.compact()
         raise ValueError(f"Unknown photometry mode {which}", stacklevel=3)
 
     @staticmethod
     def _check_filename(origin, strict=True):
-        if origin.suffix.lower() != ".ies":
-            msg = f"Unexpected extension {origin.suffix!s}. Expected .ies"
+        if origin.suffix.lower() not in (".ies", ".ldt"):
+            msg = f"Unexpected extension {origin.suffix!s}. Expected .ies or .ldt"
             if strict:
                 raise IESPathError(msg)
             else:
@@ -215,3 +443,11 @@ class IESFile:
         numeric = data[0:13]
         blocks = data[13:]
         return version, header, tilt, numeric, blocks
+
+
+def _read_or_error(cls, raw, strict=True):
+    """parse one file for read_many, returning rather than raising errors"""
+    try:
+        return cls.read(raw, strict=strict)
+    except Exception as e:
+        return e
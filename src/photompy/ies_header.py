@@ -1,6 +1,7 @@
 from dataclasses import dataclass, asdict, replace
 from enum import IntEnum, StrEnum
 from datetime import date
+import hashlib
 import warnings
 from .exceptions import IESHeaderError
 from .photometry import PhotometricType
@@ -78,6 +79,19 @@ class IESHeader:
     _v11: float
     input_watts: float
 
+    def __hash__(self):
+        return hash(self.fingerprint)
+
+    @property
+    def fingerprint(self):
+        """stable digest of the version, keywords and numeric fields"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(self.version).encode())
+        for key, val in sorted(self.keywords.items()):
+            digest.update(f"[{key}]{val}\n".encode())
+        digest.update(" ".join(map(repr, self.to_float())).encode())
+        return digest.hexdigest()
+
     @property
     def file_generation_type(self):
         if self.version.supports_filegen:
@@ -169,6 +183,7 @@ class IESHeader:
             "TESTLAB": "PhotomPy",
             "ISSUEDATE": today,
             "MANUFAC": "PhotomPy",  # todo: add version
+            "TILT": "NONE",
         }
 
         return cls(
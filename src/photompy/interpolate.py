@@ -42,7 +42,12 @@ def get_intensity(theta, phi, valdict):
     theta: arraylike of vertical angle value of interest
     phi: arraylike of horizontal/azimuthal angle value of interest
     valdict: value dictionary containing theta, phi, value triplets
+
+    may also be called as get_intensity(photometry, theta, phi)
     """
+    if hasattr(theta, "get_intensity"):
+        return theta.get_intensity(phi, valdict)
+
     thetamap = valdict["thetas"]
     phimap = valdict["phis"]
     valuemap = valdict["values"]
@@ -54,23 +59,53 @@ def get_intensity(theta, phi, valdict):
     # Range checks for theta and phi
     if np.any(theta < 0) or np.any(theta > 180):
         raise ValueError("Theta values must be between 0 and 180 degrees")
+
+    weights = bilinear_weights(thetamap, phimap, theta, phi)
+    return bilinear_interpolate(valuemap, *weights)
+
+
+def bilinear_weights(thetamap, phimap, theta, phi):
+    """
+    compute the grid indices and weights for bilinear interpolation
+
+    thetamap: sorted array of the grid's vertical angles
+    phimap: sorted array of the grid's horizontal angles
+    theta: arraylike of vertical angle value of interest
+    phi: arraylike of horizontal/azimuthal angle value of interest
+
+    returns (phi_indices, theta_indices, phi_weights, theta_weights), where
+    the indices point at the upper corner of the enclosing grid cell
+    """
     phi = np.mod(phi, 360)  # Normalize phi values
+    phi_indices, phi_weights = linear_weights(phimap, phi)
+    theta_indices, theta_weights = linear_weights(thetamap, theta)
+    return phi_indices, theta_indices, phi_weights, theta_weights
 
-    # Finding closest indices for phi and theta
-    phi_indices = np.searchsorted(phimap, phi, side="left")
-    theta_indices = np.searchsorted(thetamap, theta, side="left")
 
+def linear_weights(grid, points):
+    """
+    upper indices and weights for linear interpolation of points on a
+    sorted grid. a grid of a single angle gives index 0 and weight 0
+    """
+    if len(grid) == 1:
+        return np.zeros(np.shape(points), dtype=np.intp), np.zeros(np.shape(points))
     # Handle boundary conditions for interpolation
-    phi_indices = np.clip(phi_indices, 1, len(phimap) - 1)
-    theta_indices = np.clip(theta_indices, 1, len(thetamap) - 1)
+    indices = np.clip(np.searchsorted(grid, points, side="left"), 1, len(grid) - 1)
+    weights = (points - grid[indices - 1]) / (grid[indices] - grid[indices - 1])
+    return indices, weights
 
-    # Compute interpolation weights
-    phi_weights = (phi - phimap[phi_indices - 1]) / (
-        phimap[phi_indices] - phimap[phi_indices - 1]
-    )
-    theta_weights = (theta - thetamap[theta_indices - 1]) / (
-        thetamap[theta_indices] - thetamap[theta_indices - 1]
-    )
+
+def bilinear_interpolate(
+    valuemap, phi_indices, theta_indices, phi_weights, theta_weights
+):
+    """
+    evaluate a value grid of shape (num_phis, num_thetas, ...) with
+    precomputed bilinear indices and weights (see `bilinear_weights`)
+    """
+    # broadcast weights over any trailing channel axes
+    extra = (1,) * (np.ndim(valuemap) - 2)
+    phi_weights = np.reshape(phi_weights, np.shape(phi_weights) + extra)
+    theta_weights = np.reshape(theta_weights, np.shape(theta_weights) + extra)
 
     # Interpolate values
     val1 = (
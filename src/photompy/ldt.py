@@ -0,0 +1,215 @@
+"""
+EULUMDAT (.ldt) reading and writing.
+
+EULUMDAT files are parsed into the same IESHeader and Photometry objects as
+IES files. Intensities, stored in cd/klm, are converted to candela using
+the lamp flux; dimensions, stored in mm, are converted to meters. Fields
+with no IES equivalent are kept as `_LDT_*` keywords, so that files survive
+a round trip.
+
+Symmetry indicators (Isym) map onto LampSymmetry as:
+    0  no symmetry                  -> NONE
+    1  about the vertical axis      -> AXIAL
+    2  about the C0-C180 plane      -> HALF
+    3  about the C90-C270 plane     -> NONE (mirrored out to 360 degrees)
+    4  about both planes            -> QUAD
+"""
+
+import numpy as np
+from .exceptions import IESDataError, IESHeaderError
+from .ies_header import IESHeader, IESVersion, Units
+from .photometry import Photometry, PhotometricType, LampSymmetry
+
+_ISYM = {
+    LampSymmetry.NONE: 0,
+    LampSymmetry.AXIAL: 1,
+    LampSymmetry.HALF: 2,
+    LampSymmetry.QUAD: 4,
+}
+_NUM_HEADER_LINES = 26  # lines before the lamp sets
+
+
+def is_ldt(raw):
+    """whether raw file content looks like EULUMDAT rather than IES"""
+    head = raw[:65536].upper()
+    return not head.lstrip().startswith(b"IES") and b"TILT=" not in head
+
+
+def parse_ldt(raw, strict=True):
+    """parse raw EULUMDAT content into an (IESHeader, Photometry) pair"""
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        text = raw.decode("latin-1")  # most .ldt files are windows-1252
+    lines = [line.strip() for line in text.splitlines()]
+    if len(lines) < _NUM_HEADER_LINES:
+        raise IESHeaderError("EULUMDAT file is too short")
+
+    try:
+        isym, mc, ng = int(lines[2]), int(lines[3]), int(lines[5])
+        dims = [_num(line) / 1000 for line in lines[12:21]]  # mm -> m
+        dff, lorl, conversion, tilt = map(_num, lines[21:25])
+        num_sets = int(lines[25])
+        # fields are stored field by field across the sets: all the counts,
+        # then types, fluxes, color temperatures, cris and watts
+        sets = [
+            [lines[26 + f * num_sets + i] for f in range(6)] for i in range(num_sets)
+        ]
+        num_lamps = sum(abs(int(_num(s[0]))) for s in sets)
+        flux = sum(_num(s[2]) for s in sets)
+        watts = sum(_num(s[5]) for s in sets)
+        start = _NUM_HEADER_LINES + 6 * num_sets
+        ratios = lines[start : start + 10]
+    except (ValueError, IndexError) as e:
+        raise IESHeaderError(f"Malformed EULUMDAT header: {e}") from None
+
+    num_planes = {0: mc, 1: 1, 2: mc // 2 + 1, 3: mc // 2 + 1, 4: mc // 4 + 1}
+    if isym not in num_planes:
+        raise IESHeaderError(f"Bad EULUMDAT symmetry indicator {isym}")
+    tokens = " ".join(lines[start + 10 :]).replace(",", ".").split()
+    needed = mc + ng + num_planes[isym] * ng
+    if len(tokens) < needed:
+        raise IESDataError(f"Expected {needed} numbers, found {len(tokens)}")
+    nums = np.array(tokens[:needed], dtype=np.float64)
+
+    cangles = nums[:mc]
+    thetas = nums[mc : mc + ng]
+    stored = nums[mc + ng :].reshape(num_planes[isym], ng)
+    stored = stored * conversion * (flux if flux > 0 else 1000) / 1000  # cd
+    phis, values = _unfold(isym, cangles, stored)
+
+    keywords = {
+        "TEST": lines[7],
+        "MANUFAC": lines[0],
+        "LUMINAIRE": lines[8],
+        "LUMCAT": lines[9],
+        "ISSUEDATE": lines[11],
+        "LAMP": ", ".join(s[1] for s in sets),
+        "_LDT_FILENAME": lines[10],
+        "_LDT_ITYP": lines[1],
+        "_LDT_DFF": f"{dff:g}",
+        "_LDT_LORL": f"{lorl:g}",
+        "_LDT_TILT": f"{tilt:g}",
+        "_LDT_LUMINOUS_AREA": " ".join(f"{d * 1000:g}" for d in dims[3:]),
+        "_LDT_LAMP_SETS": " | ".join(" ; ".join(s) for s in sets),
+        "_LDT_DIRECT_RATIOS": " ".join(ratios),
+        "TILT": "NONE",
+    }
+    header = IESHeader(
+        version=IESVersion.V2002,
+        keywords={key: val for key, val in keywords.items() if val != ""},
+        num_lamps=max(num_lamps, 1),
+        lumens_per_lamp=flux / max(num_lamps, 1),
+        multiplier=1.0,
+        num_vert_angles=len(thetas),
+        num_horiz_angles=len(phis),
+        photometric_type=PhotometricType.C,
+        units=Units.METERS,
+        width=dims[1] if dims[1] > 0 else dims[0],  # 0 width: circular
+        length=dims[0],
+        height=dims[2],
+        ballast_factor=1.0,
+        _v11=1.0,
+        input_watts=watts,
+    )
+    phot = Photometry(
+        thetas=thetas,
+        phis=phis,
+        values=values,
+        photometric_type=PhotometricType.C,
+        strict=strict,
+    )
+    return header, phot
+
+
+def format_ldt(header, phot):
+    """return EULUMDAT text for a header and single-channel photometry"""
+    phot._check_single_channel()
+    if phot.photometric_type != PhotometricType.C:
+        raise IESDataError("EULUMDAT only supports type C photometry")
+    if phot.symmetry not in _ISYM:
+        phot = phot.expanded()
+    isym = _ISYM[phot.symmetry]
+    exp = phot.expanded()
+    cangles = exp.phis[:-1] if np.isclose(exp.phis[-1], 360) else exp.phis
+    stored = phot.values
+    if isym == 0 and len(phot.phis) > len(cangles):
+        stored = stored[: len(cangles)]  # 360 duplicates 0
+
+    kw = header.keywords
+    flux = header.num_lamps * header.lumens_per_lamp
+    if flux <= 0:
+        flux = 1000  # store candela unchanged
+    scale = 1000 if header.units == Units.METERS else 304.8  # -> mm
+    sets = [s.split(" ; ") for s in kw.get("_LDT_LAMP_SETS", "").split(" | ") if s]
+    if not sets:
+        lamp = kw.get("LAMP", "")
+        watts = f"{header.input_watts:g}"
+        sets = [[str(header.num_lamps), lamp, f"{flux:g}", "", "", watts]]
+    area = kw.get("_LDT_LUMINOUS_AREA", "").split() or ["0"] * 6
+    ratios = kw.get("_LDT_DIRECT_RATIOS", "").split() or ["0"] * 10
+
+    lines = [
+        kw.get("MANUFAC", "photompy"),
+        kw.get("_LDT_ITYP", "1" if isym == 1 else "3" if isym else "0"),
+        str(isym),
+        str(len(cangles)),
+        f"{_step(cangles):g}",
+        str(len(phot.thetas)),
+        f"{_step(phot.thetas):g}",
+        kw.get("TEST", ""),
+        kw.get("LUMINAIRE", ""),
+        kw.get("LUMCAT", ""),
+        kw.get("_LDT_FILENAME", ""),
+        kw.get("ISSUEDATE", ""),
+        f"{header.length * scale:g}",
+        f"{header.width * scale:g}",
+        f"{header.height * scale:g}",
+        *area,
+        kw.get("_LDT_DFF", "0"),
+        kw.get("_LDT_LORL", "100"),
+        "1",  # intensities are written already converted
+        kw.get("_LDT_TILT", "0"),
+        str(len(sets)),
+        *(s[f] for f in range(6) for s in sets),
+        *ratios,
+    ]
+    numbers = np.concatenate([cangles, phot.thetas, (stored * 1000 / flux).ravel()])
+    text = "\r\n".join(lines) + "\r\n"
+    text += "\r\n".join(np.char.mod("%.6g", numbers)) + "\r\n"
+    return text
+
+
+def _num(line):
+    return float(line.replace(",", "."))
+
+
+def _step(angles):
+    """spacing of evenly spaced angles, or 0"""
+    if len(angles) < 2:
+        return 0.0
+    steps = np.diff(angles)
+    return float(steps[0]) if np.allclose(steps, steps[0]) else 0.0
+
+
+def _unfold(isym, cangles, stored):
+    """horizontal angles and values for the stored planes of each Isym"""
+    if isym == 1:
+        return np.array([0.0]), stored
+    if isym in (2, 4):
+        return cangles[: len(stored)], stored
+    if isym == 3:
+        # planes C270..C360..C90 are stored; mirror them about C90-C270
+        quarter = len(cangles) // 4
+        stored_angles = np.concatenate(
+            [cangles[3 * quarter :] - 360, cangles[: quarter + 1]]
+        )
+        phis = np.concatenate([cangles, [360.0]])
+        source = np.where(phis <= 90, phis, 180 - phis)
+        source = np.where(phis >= 270, phis - 360, source)
+        index = np.abs(stored_angles[None, :] - source[:, None]).argmin(axis=1)
+        return phis, stored[index]
+    # no symmetry; close the circle with a copy of C0
+    if np.isclose(cangles[-1], 360):
+        return cangles, stored
+    return np.concatenate([cangles, [360.0]]), np.vstack([stored, stored[:1]])
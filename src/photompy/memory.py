@@ -0,0 +1,30 @@
+from collections import Counter
+
+
+def memory_report(objects, top=10):
+    """
+    aggregate the memory usage of many IESFile or Photometry objects.
+
+    objects: mapping of names to objects, or an iterable of objects (named
+        by position)
+    returns {"total": bytes, "objects": [(name, bytes)...],
+    "cache": [(cache entry name, bytes summed over objects)...]}, with the
+    `top` heaviest objects and cache entries, heaviest first
+    """
+    if not hasattr(objects, "items"):
+        objects = dict(enumerate(objects))
+
+    totals = {}
+    cache = Counter()
+    for name, obj in objects.items():
+        usage = obj.memory_usage(deep=True)
+        totals[name] = usage["total"]
+        phot = usage.get("photometry", usage)
+        cache.update(phot["cache"])
+
+    heaviest = sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+    return {
+        "total": sum(totals.values()),
+        "objects": heaviest[:top],
+        "cache": cache.most_common(top),
+    }
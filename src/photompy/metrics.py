@@ -0,0 +1,219 @@
+"""
+Photometric metrics: luminous flux, zonal lumens, beam and field angles,
+spacing criterion, efficacy and light output ratio (LOR).
+
+`summarize` works on fully expanded value grids in candela. Leading axes
+are a stack of lamps on the same grid, so a whole catalog is summarized
+in one vectorized pass; the solid-angle weights depend only on the grid
+and zones, and are cached.
+
+    summary = catalog_metrics(files)          # arrays, one entry per lamp
+    summary["beam_angle"], summary["zonal_lumens"][:, 2]
+
+Definitions:
+    beam_angle, field_angle: full angle at which intensity falls to 50%
+        and 10% of the maximum intensity, at the outer edge of the first
+        lobe reaching that level in each C-plane, averaged over C-planes
+    spacing_criterion: largest spacing to mounting height ratio 2 tan(t)
+        for which the illuminance midway between two luminaires is at
+        least that directly below one, for spacing along the C0-C180
+        and C90-C270 planes
+    efficacy: luminaire lumens per input watt
+    lor: luminaire lumens over the rated lamp lumens
+"""
+
+import numpy as np
+from .calculate import compute_frustrum_area
+from .regrid import GridCache, grid_signature, regrid_operator
+
+ZONES = ((0, 30), (0, 40), (0, 60), (0, 90), (90, 180), (0, 180))
+
+_WEIGHTS = GridCache(maxsize=32)
+
+
+def solid_angle_weights(thetas, phis, zones=ZONES):
+    """
+    return (phi_weights, band_areas, zone_areas) for a grid: phi_weights
+    (num_phis,) average over C-planes, band_areas (num_thetas,) are the
+    solid angles of the theta band around each sample, and zone_areas
+    (num_zones, num_thetas) the parts of each band within each zone.
+    shared between calls, and read-only
+    """
+    zones = tuple(tuple(float(z) for z in zone) for zone in zones)
+    key = (grid_signature(thetas, phis), zones)
+    return _WEIGHTS.get_or_create(key, lambda: _make_weights(thetas, phis, zones))
+
+
+def summarize(values, thetas, phis, zones=ZONES, input_watts=None, lamp_lumens=None):
+    """
+    compute metrics for values of shape (..., num_phis, num_thetas) on a
+    fully expanded grid (thetas 0 to 180, phis 0 to 360).
+
+    input_watts, lamp_lumens: arrays broadcast against the leading axes;
+        efficacy and LOR are NaN where they are missing or not positive
+    returns a dict of arrays with the leading shape of `values`, except
+        "zonal_lumens" (..., num_zones) and "spacing_criterion" (..., 2)
+    """
+    values = np.asarray(values)
+    thetas = np.asarray(thetas, dtype=np.float64)
+    phis = np.asarray(phis, dtype=np.float64)
+    if values.shape[-2:] != (len(phis), len(thetas)):
+        raise ValueError("values must end with (num_phis, num_thetas) axes")
+    phi_weights, band_areas, zone_areas = solid_angle_weights(thetas, phis, zones)
+
+    # average over C-planes, then integrate over theta (float64 throughout)
+    mean = np.einsum("...pt,p->...t", values, phi_weights, dtype=np.float64)
+    total = mean @ band_areas
+    zonal = mean @ zone_areas.T
+    peak = values.max(axis=(-2, -1))
+
+    return {
+        "total_lumens": total,
+        "zones": np.asarray(zones, dtype=np.float64),
+        "zonal_lumens": zonal,
+        "max_intensity": peak,
+        "beam_angle": _spread(values, thetas, phi_weights, 0.5 * peak),
+        "field_angle": _spread(values, thetas, phi_weights, 0.1 * peak),
+        "spacing_criterion": _spacing_criterion(values, thetas, phis, mean[..., 0]),
+        "efficacy": _ratio(total, input_watts),
+        "lor": _ratio(total, lamp_lumens),
+    }
+
+
+def lamp_metrics(ies, zones=ZONES, num_thetas=181, num_phis=361):
+    """
+    metrics for one IESFile, computed on its interpolated photometry.
+    returns floats, with "zonal_lumens" as a {(start, stop): lumens} dict
+    """
+    summary = catalog_metrics([ies], zones, num_thetas, num_phis)
+    metrics = {name: value[0] for name, value in summary.items() if name != "zones"}
+    metrics["zonal_lumens"] = {
+        tuple(zone): float(lm) for zone, lm in zip(zones, metrics["zonal_lumens"])
+    }
+    metrics["spacing_criterion"] = tuple(map(float, metrics["spacing_criterion"]))
+    for name, value in metrics.items():
+        if isinstance(value, np.generic):
+            metrics[name] = float(value)
+    return metrics
+
+
+def catalog_metrics(files, zones=ZONES, num_thetas=181, num_phis=361):
+    """
+    metrics for many IESFile objects at once. each lamp is interpolated
+    onto the same grid, and the stack is summarized in one pass. returns
+    the dict of `summarize`, with one entry per lamp along the first axis.
+    the lamps' caches are left as they were
+    """
+    files = list(files)
+    for ies in files:
+        ies.photometry._check_single_channel()
+    thetas = np.linspace(0, 180, num_thetas)
+    phis = np.linspace(0, 360, num_phis)
+    values = np.stack(
+        [_regridded_values(ies.photometry, thetas, phis) for ies in files]
+    ).reshape(len(files), num_phis, num_thetas)
+    headers = [ies.header for ies in files]
+    return summarize(
+        values,
+        thetas,
+        phis,
+        zones,
+        input_watts=np.array([h.input_watts for h in headers], dtype=np.float64),
+        lamp_lumens=np.array(
+            [h.num_lamps * h.lumens_per_lamp for h in headers], dtype=np.float64
+        ),
+    )
+
+
+# ---------------- Internals -----------------------
+
+
+def _bands(thetas):
+    """lower and upper edges of the theta band around each sample"""
+    mids = (thetas[1:] + thetas[:-1]) / 2
+    return np.concatenate(([thetas[0]], mids)), np.concatenate((mids, [thetas[-1]]))
+
+
+def _regridded_values(phot, thetas, phis):
+    """values of `phot` on the thetas/phis grid, without caching any grids"""
+    exp = phot._cache.get("expanded")
+    if exp is None:
+        exp = phot._expand_angles()
+    return regrid_operator(exp.thetas, exp.phis, thetas, phis).apply(exp.values)
+
+
+def _make_weights(thetas, phis, zones):
+    thetas = np.asarray(thetas, dtype=np.float64)
+    phis = np.asarray(phis, dtype=np.float64)
+    # trapezoid rule over phi, so a closing 360 plane counts half, as does 0
+    steps = np.diff(phis)
+    phi_weights = np.zeros(len(phis))
+    phi_weights[:-1] += steps / 2
+    phi_weights[1:] += steps / 2
+    if phi_weights.sum() > 0:
+        phi_weights /= phi_weights.sum()
+    else:  # a single plane
+        phi_weights[:] = 1.0
+
+    lower, upper = _bands(thetas)
+    band_areas = compute_frustrum_area(lower, upper)
+    zone_areas = np.array(
+        [
+            compute_frustrum_area(np.clip(lower, *zone), np.clip(upper, *zone))
+            for zone in zones
+        ]
+    )
+    for arr in (phi_weights, band_areas, zone_areas):
+        arr.flags.writeable = False
+    return phi_weights, band_areas, zone_areas
+
+
+def _crossing(thetas, curves, level):
+    """
+    theta at which `curves` (..., num_thetas) first fall below `level`
+    (broadcast against the leading axes) after reaching it, linearly
+    interpolated: the outer edge of the first lobe. curves that never fall
+    back below the level give the last theta, and those that never reach
+    it the first
+    """
+    level = np.asarray(level)
+    above = curves >= level[..., None]
+    after = np.logical_or.accumulate(above, axis=-1) & ~above
+    lo = (np.argmax(after, axis=-1) - 1).clip(0, len(thetas) - 2)[..., None]
+    e0 = np.take_along_axis(curves, lo, axis=-1)[..., 0] - level
+    e1 = np.take_along_axis(curves, lo + 1, axis=-1)[..., 0] - level
+    drop = e0 - e1
+    frac = np.clip(np.divide(e0, drop, out=np.zeros_like(drop), where=drop > 0), 0, 1)
+    lo = lo[..., 0]
+    angle = thetas[lo] + frac * (thetas[lo + 1] - thetas[lo])
+    angle = np.where(after.any(axis=-1), angle, thetas[-1])
+    return np.where(above.any(axis=-1), angle, thetas[0])
+
+
+def _spread(values, thetas, phi_weights, level):
+    """full angle within which intensity stays at or above `level`"""
+    level = np.asarray(level, dtype=np.float64)[..., None]  # per C-plane
+    return 2 * _crossing(thetas, values, level) @ phi_weights
+
+
+def _spacing_criterion(values, thetas, phis, center):
+    """spacing criteria along the C0-C180 and C90-C270 planes"""
+    below = thetas < 90
+    cubed = np.cos(np.radians(thetas[below])) ** 3
+    criteria = []
+    for plane in (0, 90):
+        a = np.abs(phis - plane).argmin()
+        b = np.abs(phis - (plane + 180)).argmin()
+        midway = (values[..., a, below] + values[..., b, below]) * cubed
+        angle = _crossing(thetas[below], midway, center)
+        criteria.append(2 * np.tan(np.radians(angle)))
+    return np.stack(criteria, axis=-1)
+
+
+def _ratio(total, reference):
+    """total / reference, NaN where the reference is missing or not positive"""
+    if reference is None:
+        return np.full(np.shape(total), np.nan)
+    reference = np.asarray(reference, dtype=np.float64)
+    ok = reference > 0
+    return np.where(ok, total / np.where(ok, reference, 1), np.nan)
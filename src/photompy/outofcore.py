@@ -0,0 +1,115 @@
+"""
+Block processing for photometries whose values are a numpy.memmap.
+
+When `Photometry.values` is a memmap, reductions (total power, max),
+scaling, expansion and interpolation work through it a block of rows at a
+time, and derived values are written to memmaps in temporary files, so
+peak memory is bounded by the block size rather than the grid size.
+
+    values = np.memmap("export.f64", dtype=np.float64, mode="r", shape=(P, T))
+    phot = Photometry(thetas, phis, values, PhotometricType.C)
+    outofcore.configure(block_bytes=16 * 2**20, directory="/scratch")
+"""
+
+import tempfile
+import numpy as np
+
+_config = {
+    "block_bytes": 64 * 2**20,
+    "directory": None,  # None: the system temporary directory
+}
+
+
+def configure(block_bytes=None, directory=None):
+    """
+    set the memory used per block, and where memmap outputs are stored.
+    arguments left as None keep their current value
+    """
+    if block_bytes is not None:
+        if block_bytes < 1:
+            raise ValueError("block_bytes must be positive")
+        _config["block_bytes"] = block_bytes
+    if directory is not None:
+        _config["directory"] = directory
+
+
+def is_memmap(arr):
+    return isinstance(arr, np.memmap)
+
+
+def row_blocks(num_rows, row_nbytes):
+    """yield slices of rows that each fit within the block size"""
+    step = max(1, _config["block_bytes"] // max(1, row_nbytes))
+    for start in range(0, num_rows, step):
+        yield slice(start, min(start + step, num_rows))
+
+
+def new_memmap(shape, dtype=np.float64):
+    """
+    a zero-filled memmap in an anonymous temporary file, which is removed
+    once the array is no longer referenced
+    """
+    with tempfile.TemporaryFile(dir=_config["directory"]) as file:
+        return np.memmap(file, dtype=dtype, mode="w+", shape=shape)
+
+
+def row_sum(values, weights=None):
+    """(weighted) sum over the first axis, accumulated in float64"""
+    total = np.zeros(values.shape[1:])
+    for rows in row_blocks(len(values), values[0].nbytes):
+        if weights is None:
+            total += values[rows].sum(axis=0, dtype=np.float64)
+        else:
+            total += np.tensordot(weights[rows], values[rows], axes=1)
+    return total
+
+
+def row_max(values):
+    """maximum over the first two axes"""
+    blocks = row_blocks(len(values), values[0].nbytes)
+    return np.max([values[rows].max(axis=(0, 1)) for rows in blocks], axis=0)
+
+
+def scaled(values, factor):
+    """values * factor, written to a new memmap of the same dtype"""
+    out = new_memmap(values.shape, values.dtype)
+    for rows in row_blocks(len(values), values[0].nbytes):
+        out[rows] = values[rows] * factor
+    return out
+
+
+def astype(values, dtype):
+    """values converted to dtype, written to a new memmap"""
+    out = new_memmap(values.shape, dtype)
+    for rows in row_blocks(len(values), values[0].nbytes):
+        out[rows] = values[rows]
+    return out
+
+
+def gather_rows(values, rows, num_thetas):
+    """
+    a memmap whose row i is values[rows[i]], zero-padded to num_thetas
+    columns
+    """
+    out = new_memmap((len(rows), num_thetas) + values.shape[2:], values.dtype)
+    width = values.shape[1]
+    for block in row_blocks(len(rows), out[0].nbytes):
+        out[block, :width] = values[rows[block]]
+    return out
+
+
+def map_rows(func, shape, row_nbytes, dtype=np.float64):
+    """a memmap of `shape` whose row blocks are filled with func(rows)"""
+    out = new_memmap(shape, dtype)
+    for rows in row_blocks(shape[0], row_nbytes):
+        out[rows] = func(rows)
+    return out
+
+
+def iter_row_blocks(arr):
+    """yield arr in row blocks if it is a memmap, or whole otherwise"""
+    if not is_memmap(arr) or arr.ndim == 0:
+        yield arr
+        return
+    for rows in row_blocks(len(arr), arr[0].nbytes if len(arr) else 0):
+        yield arr[rows]
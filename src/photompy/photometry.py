@@ -1,9 +1,34 @@
 from dataclasses import dataclass, field
 from enum import IntEnum, Enum
+import hashlib
+import sys
+import threading
 import numpy as np
-from .calculate import compute_frustrum_area
+from . import aio, outofcore
+from .calculate import phi_band_weights, theta_band_areas
+from .directions import direction_table
+from .interpolate import bilinear_weights, bilinear_interpolate, linear_weights
+from .regrid import regrid_operator
 from .plot import plot_polar, plot_cartesian
 from .exceptions import IESDataError
+from .profiling import span
+
+
+_DTYPES = (np.dtype(np.float64), np.dtype(np.float32))
+_config = {"dtype": np.dtype(np.float64)}
+
+
+def set_default_dtype(dtype):
+    """
+    set the dtype in which new photometries store their values, derived
+    grids and coordinates: np.float64 (the default) or np.float32.
+    photometries created before the call keep their dtype
+    """
+    _config["dtype"] = _check_dtype(dtype)
+
+
+def get_default_dtype():
+    return _config["dtype"]
 
 
 class PhotometricType(IntEnum):
@@ -28,6 +53,8 @@ class Photometry:
     photometric_type: PhotometricType
     symmetry: LampSymmetry = field(init=False)
     strict: bool = True  # ?? I don't actually remember why this is here or what it's supposed to do
+    # storage dtype of values and derived grids; None: the global default
+    dtype: np.dtype = field(default=None, compare=False)
 
     _cache: dict = field(
         default_factory=dict,
@@ -35,52 +62,201 @@ class Photometry:
         repr=False,
         compare=False,
     )
+    # guards computing derived products and scaling; see _cached
+    _lock: threading.RLock = field(
+        default_factory=threading.RLock,
+        init=False,
+        repr=False,
+        compare=False,
+    )
 
     def __post_init__(self):
-        if self.values.shape != (len(self.phis), len(self.thetas)):
-            raise IESDataError("values shape mismatch")
-        self.symmetry = self._infer_symmetry()
+        with span("photometry.post_init", elements=self.values.size):
+            self.dtype = _check_dtype(self.dtype)
+            if self.values.dtype != self.dtype:
+                if outofcore.is_memmap(self.values):
+                    self.values = outofcore.astype(self.values, self.dtype)
+                else:
+                    self.values = self.values.astype(self.dtype)
+            if self.values.ndim not in (2, 3):
+                raise IESDataError("values must be 2d, or 3d with a channel axis")
+            if self.values.shape[:2] != (len(self.phis), len(self.thetas)):
+                raise IESDataError("values shape mismatch")
+            with span("photometry.infer_symmetry"):
+                self.symmetry = self._infer_symmetry()
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in ("thetas", "phis", "values"):
+            # derived caches, the fingerprint included, describe the old data
+            object.__setattr__(self, "_cache", {})
 
     def __eq__(self, other):
         if not isinstance(other, Photometry):
             return NotImplemented
-
         if self.photometric_type != other.photometric_type:
             return False
-
-        if self.symmetry != other.symmetry:
+        # differing fingerprints, where both are already known, settle it
+        mine = self._cache.get("fingerprint")
+        theirs = other._cache.get("fingerprint")
+        if mine is not None and theirs is not None and mine != theirs:
             return False
+        return (
+            np.array_equal(self.thetas, other.thetas)
+            and np.array_equal(self.phis, other.phis)
+            and np.array_equal(self.values, other.values)
+        )
 
-        if not np.array_equal(self.thetas, other.thetas):
-            return False
-        if not np.array_equal(self.phis, other.phis):
+    def __hash__(self):
+        return hash(self.fingerprint)
+
+    def __reduce__(self):
+        # derived caches are left out; they are rebuilt on demand
+        return (
+            Photometry,
+            (
+                self.thetas,
+                self.phis,
+                self.values,
+                self.photometric_type,
+                self.strict,
+                self.dtype,
+            ),
+        )
+
+    def __copy__(self):
+        return self.copy()
+
+    def copy(self):
+        """
+        return a clone that shares this photometry's arrays and cached
+        derived photometries. The shared arrays are made read-only (cached
+        photometries always are); scaling either object replaces its arrays
+        and caches instead of writing to them, so clones are cheap and stay
+        independent.
+        """
+        self._freeze()
+        new = object.__new__(Photometry)
+        for name in ("thetas", "phis", "values", "photometric_type", "strict", "dtype"):
+            setattr(new, name, getattr(self, name))
+        new.symmetry = self.symmetry
+        new._cache = dict(self._cache)
+        new._lock = threading.RLock()
+        return new
+
+    def astype(self, dtype):
+        """
+        return a photometry storing its values in `dtype`, or this one if it
+        already does. derived caches are not carried over
+        """
+        if _check_dtype(dtype) == self.dtype:
+            return self
+        return Photometry(
+            thetas=self.thetas,
+            phis=self.phis,
+            values=self.values,
+            photometric_type=self.photometric_type,
+            strict=self.strict,
+            dtype=dtype,
+        )
+
+    @property
+    def fingerprint(self):
+        """
+        stable digest of the angles, values and photometric type. computed
+        once and cached until the angles or values are reassigned or scaled.
+        after editing an array in place, reassign it to refresh the digest
+        """
+        return self._cached("fingerprint", lambda: _fingerprint(self))
+
+    def isclose(self, other, rtol=1e-5, atol=0.0):
+        """whether two photometries are equal within a tolerance"""
+        if self.photometric_type != other.photometric_type:
             return False
-        if not np.array_equal(self.values, other.values):
+        if self.values.shape != other.values.shape:
             return False
-
-        return True
+        return (
+            np.allclose(self.thetas, other.thetas, rtol=rtol, atol=atol)
+            and np.allclose(self.phis, other.phis, rtol=rtol, atol=atol)
+            and np.allclose(self.values, other.values, rtol=rtol, atol=atol)
+        )
 
     @property
     def coords(self):
-        try:
-            return self._cache["coords"]
-        except KeyError:
-            c = self._make_coords()
-            self._cache["coords"] = c
-            return c
+        return self._cached("coords", self._make_coords)
 
     @property
     def photometric_coords(self):
-        try:
-            return self._cache["pcoords"]
-        except KeyError:
-            pc = self._make_photometric_coords()
-            self._cache["pcoords"] = pc
-            return pc
+        return self._cached("pcoords", self._make_photometric_coords)
+
+    @property
+    def num_channels(self):
+        """number of channels stacked along the trailing axis of values"""
+        return self.values.shape[2] if self.values.ndim == 3 else 1
+
+    @property
+    def is_multichannel(self):
+        return self.values.ndim == 3
+
+    def channel(self, index):
+        """return a single-channel photometry for one channel"""
+        if not self.is_multichannel:
+            if index != 0:
+                raise IndexError("photometry has a single channel")
+            return self
+        return Photometry(
+            thetas=self.thetas,
+            phis=self.phis,
+            values=self.values[:, :, index],
+            photometric_type=self.photometric_type,
+            dtype=self.dtype,
+        )
+
+    def memory_usage(self, deep=True):
+        """
+        return the bytes held by the base arrays and by each cache entry, as
+        {"thetas", "phis", "values", "cache": {name: bytes}, "total"}.
+        with deep=True, cached photometries include their own caches.
+        arrays that share memory are each counted in full.
+        """
+        usage = {
+            "thetas": self.thetas.nbytes,
+            "phis": self.phis.nbytes,
+            "values": self.values.nbytes,
+        }
+        cache = {}
+        for key, item in list(self._cache.items()):
+            if isinstance(item, Photometry):
+                size = item.memory_usage(deep=deep)
+                cache[_cache_name(key)] = size["total"] if deep else size["values"]
+            else:
+                cache[_cache_name(key)] = _nbytes(item)
+        usage["cache"] = cache
+        usage["total"] = sum(usage[k] for k in ("thetas", "phis", "values"))
+        usage["total"] += sum(cache.values())
+        return usage
+
+    def drop_caches(self, kind="all"):
+        """
+        release derived caches, returning the number of bytes released.
+        kind: "all", "expanded", "interp" or "coords"
+        """
+        if kind not in _CACHE_KINDS:
+            raise ValueError(f"unknown cache kind {kind}")
+        with self._lock:
+            usage = self.memory_usage()["cache"]
+            released = 0
+            for key in list(self._cache):
+                if _CACHE_KINDS[kind](key):
+                    released += usage[_cache_name(key)]
+                    del self._cache[key]
+        return released
 
     def max(self):
-        """maximum value of photometry values"""
-        return self.values.max()
+        """maximum value of photometry values, per channel"""
+        if outofcore.is_memmap(self.values):
+            return outofcore.row_max(self.values)
+        return self.values.max(axis=(0, 1))
 
     def total(self):
         """convenience alias for total_optical_power"""
@@ -92,73 +268,193 @@ class Photometry:
 
     def expanded(self):
         """return a photometry with fully mirrored values"""
-        try:
-            exp = self._cache["expanded"]
-        except KeyError:
-            exp = self._expand_angles()  # compute expansion
-            self._cache["expanded"] = exp
-        return exp
+
+        def expand():
+            with span("expanded", elements=self.values.size) as sp:
+                exp = self._expand_angles()  # compute expansion
+                sp.add(output_elements=exp.values.size)
+            return exp
+
+        return self._cached("expanded", expand)
 
     def interpolated(self, num_thetas=181, num_phis=361):
         """return a fully mirrored photometry with"""
 
+        def interpolate():
+            with span("interpolated", output_elements=num_thetas * num_phis):
+                return self._interpolate_angles(num_thetas, num_phis)
+
+        return self._cached(("interpolated", num_thetas, num_phis), interpolate)
+
+    async def ainterpolated(self, num_thetas=181, num_phis=361, chunk_size=None):
+        """
+        async counterpart of `interpolated`, evaluated in chunks on the
+        executor configured in photompy.aio
+        """
         key = ("interpolated", num_thetas, num_phis)
         try:
-            interp = self._cache[key]
+            return self._cache[key]
         except KeyError:
-            interp = self._interpolate_angles(num_thetas, num_phis)
-            self._cache[key] = interp
-        return interp
+            pass
+        exp = await aio.run(self.expanded)
+        thetas = np.linspace(0, 180, num_thetas)
+        phis = np.linspace(0, 360, num_phis)
+        values = await aio.evaluate(
+            exp.get_intensity, thetas[None, :], phis[:, None], chunk_size
+        )
+        interp = await aio.run(
+            Photometry,
+            thetas=thetas,
+            phis=phis,
+            values=values,
+            photometric_type=self.photometric_type,
+            dtype=self.dtype,
+        )
+        return self._cached(key, lambda: interp)
+
+    def regridded(self, thetas, phis):
+        """
+        return a fully mirrored photometry resampled onto arbitrary theta
+        and phi arrays. The interpolation operator is shared with every
+        other photometry on the same grid.
+        """
+        exp = self.expanded()
+        op = regrid_operator(exp.thetas, exp.phis, thetas, phis)
+        return op.apply(exp)
+
+    def detect_symmetry(self, rtol=1e-3, atol=0.0):
+        """
+        detect the highest lateral symmetry the values actually have, within
+        a tolerance of `atol + rtol * max`, regardless of the symmetry the
+        horizontal angles declare
+        """
+        exp = self.expanded()
+        phis, values = exp.phis, exp.values
+        tol = atol + rtol * np.abs(values).max()
+
+        if np.abs(values - values[:1]).max() <= tol:
+            return LampSymmetry.AXIAL
+        if not _is_mirrored(phis, 360) or not _mirror_close(values, tol):
+            return LampSymmetry.NONE
+        half = phis <= 180
+        if _is_mirrored(phis[half], 180) and _mirror_close(values[half], tol):
+            return LampSymmetry.QUAD
+        return LampSymmetry.HALF
+
+    def compact(self, rtol=1e-3, atol=0.0):
+        """
+        return the photometry reduced to the smallest span of horizontal
+        angles its detected symmetry allows (see `detect_symmetry`)
+        """
+        symmetry = self.detect_symmetry(rtol=rtol, atol=atol)
+        if symmetry == self.symmetry:
+            return self
+
+        exp = self.expanded()
+        if symmetry == LampSymmetry.AXIAL:
+            keep = exp.phis <= 0
+        elif symmetry == LampSymmetry.QUAD:
+            keep = exp.phis <= 90
+        elif symmetry == LampSymmetry.HALF:
+            keep = exp.phis <= 180
+        else:
+            keep = np.ones(len(exp.phis), dtype=bool)
+
+        return Photometry(
+            thetas=self.thetas,
+            phis=exp.phis[keep],
+            values=exp.values[keep, : len(self.thetas)],
+            photometric_type=self.photometric_type,
+            dtype=self.dtype,
+        )
+
+    def decimate(self, max_rel_error=1e-3, max_abs_error=None):
+        """
+        return a photometry on a reduced, possibly non-uniform subset of the
+        original angles, chosen so that bilinear reconstruction stays within
+        the error bound at every original grid point.
+
+        max_rel_error: allowed error relative to the maximum value
+        max_abs_error: allowed absolute error
+        If both are given, both must hold.
+        """
+        tol = np.inf
+        if max_rel_error is not None:
+            tol = max_rel_error * np.abs(self.values).max()
+        if max_abs_error is not None:
+            tol = min(tol, max_abs_error)
+        if not np.isfinite(tol):
+            raise ValueError("max_rel_error or max_abs_error must be given")
+
+        keep_t = np.zeros(len(self.thetas), dtype=bool)
+        keep_p = np.zeros(len(self.phis), dtype=bool)
+        keep_t[[0, -1]] = True
+        keep_p[[0, -1]] = True
+
+        while True:
+            err = self._decimation_error(keep_t, keep_p)
+            bad = err > tol
+            if not bad.any():
+                break
+            # every offending point lies on an angle that is not yet kept;
+            # add the worst such angle within each gap between kept angles
+            terr = np.where(bad & ~keep_t[None, :], err, 0).max(axis=0)
+            perr = np.where(bad & ~keep_p[:, None], err, 0).max(axis=1)
+            keep_t |= _worst_per_gap(terr, keep_t, tol)
+            keep_p |= _worst_per_gap(perr, keep_p, tol)
+
+        return Photometry(
+            thetas=self.thetas[keep_t],
+            phis=self.phis[keep_p],
+            values=self.values[np.ix_(keep_p, keep_t)],
+            photometric_type=self.photometric_type,
+            dtype=self.dtype,
+        )
+
+    def fit_harmonics(self, order=None, max_rel_error=None, **kwargs):
+        """
+        return a compact spherical-harmonic approximation of the photometry.
+        see HarmonicPhotometry.fit
+        """
+        from .harmonics import HarmonicPhotometry  # avoid circular import
+
+        return HarmonicPhotometry.fit(
+            self, order=order, max_rel_error=max_rel_error, **kwargs
+        )
 
     def total_optical_power(self) -> float:
         """compute the total optical power"""
-        thetastep = self.thetas[1] - self.thetas[0]
-        thetasums = self.values.sum(axis=0) / len(self.phis)
-        thetas1 = np.maximum(0, self.thetas - thetastep / 2)  # Avoid negative angles
-        thetas2 = self.thetas + thetastep / 2
-        areas = compute_frustrum_area(thetas1, thetas2)
-        total_power = (thetasums * areas).sum()
+        weights = phi_band_weights(self.phis)
+        if outofcore.is_memmap(self.values):
+            thetasums = outofcore.row_sum(self.values, weights)
+        else:
+            thetasums = np.tensordot(weights, self.values, axes=1)
+        total_power = theta_band_areas(self.thetas) @ thetasums
         return total_power
 
     def scale_to_max(self, max_val):
         """scale the photometry to a maximum value"""
         if max_val <= 0:
             raise ValueError("scaling value must be positive")
-        self.values = self.values * max_val / self.values.max()
-        for phot in self._cache.values():
-            if isinstance(phot, Photometry):
-                phot.values = phot.values * max_val / phot.values.max()
-        return self.values
+        return self._rescale(lambda phot: max_val / phot.max())
 
     def scale_to_total(self, total_power):
         """scale the photometry to a total optical power"""
         if total_power <= 0:
             raise ValueError("scaling value must be positive")
-        self.values = self.values * total_power / self.total()
-        for phot in self._cache.values():
-            if isinstance(phot, Photometry):
-                phot.values = phot.values * total_power / phot.total()
-        return self.values
+        return self._rescale(lambda phot: total_power / phot.total())
 
     def scale_to_center(self, center_val):
         """scale the photometry to a center value"""
         if center_val <= 0:
             raise ValueError("scaling value must be positive")
-        self.values = self.values * center_val / self.get_intensity(0, 0)
-        for phot in self._cache.values():
-            if isinstance(phot, Photometry):
-                phot.values = phot.values * center_val / phot.get_intensity(0, 0)
-        return self.values
+        return self._rescale(lambda phot: center_val / phot.get_intensity(0, 0))
 
     def scale(self, scale_val):
         """scale the photometry by the given value"""
         if scale_val <= 0:
             raise ValueError("scaling value must be positive")
-        self.values = self.values * scale_val
-        for phot in self._cache.values():
-            if isinstance(phot, Photometry):
-                phot.values = phot.values * scale_val
-        return self.values
+        return self._rescale(lambda phot: scale_val)
 
     def get_intensity(self, theta, phi):
         """
@@ -182,45 +478,36 @@ class Photometry:
             raise ValueError("Theta values must be between 0 and 180 degrees")
         if theta.shape != phi.shape:
             raise ValueError("theta and phi must be of same length")
-        phi = np.mod(phi, 360)  # Normalize phi values
-
-        # Finding closest indices for phi and theta
-        phi_indices = np.searchsorted(phimap, phi, side="left")
-        theta_indices = np.searchsorted(thetamap, theta, side="left")
-
-        # Handle boundary conditions for interpolation
-        phi_indices = np.clip(phi_indices, 1, len(phimap) - 1)
-        theta_indices = np.clip(theta_indices, 1, len(thetamap) - 1)
 
-        # Compute interpolation weights
-        phi_weights = (phi - phimap[phi_indices - 1]) / (
-            phimap[phi_indices] - phimap[phi_indices - 1]
-        )
-        theta_weights = (theta - thetamap[theta_indices - 1]) / (
-            thetamap[theta_indices] - thetamap[theta_indices - 1]
-        )
+        with span("get_intensity", elements=theta.size):
+            weights = bilinear_weights(thetamap, phimap, theta, phi)
+            return bilinear_interpolate(valuemap, *weights)
 
-        # Interpolate values
-        val1 = (
-            valuemap[phi_indices - 1, theta_indices - 1] * (1 - phi_weights)
-            + valuemap[phi_indices, theta_indices - 1] * phi_weights
-        )
-        val2 = (
-            valuemap[phi_indices - 1, theta_indices] * (1 - phi_weights)
-            + valuemap[phi_indices, theta_indices] * phi_weights
-        )
-        final_val = val1 * (1 - theta_weights) + val2 * theta_weights
-
-        return final_val
+    async def aget_intensity(self, theta, phi, chunk_size=None):
+        """
+        async counterpart of `get_intensity`, evaluated in chunks on the
+        executor configured in photompy.aio
+        """
+        return await aio.evaluate(self.get_intensity, theta, phi, chunk_size)
 
     def plot_polar(self, **kwargs):
+        self._check_single_channel()
         exp = self.expanded()
         return plot_polar(thetas=exp.thetas, phis=exp.phis, values=exp.values, **kwargs)
 
-    def plot_cartesian(self, **kwargs):
+    def plot_cartesian(self, max_points=None, **kwargs):
+        """
+        3d plot of the expanded photometry. grids larger than `max_points`
+        (default plot.MAX_PLOT_POINTS) are decimated, keeping the peak
+        """
+        self._check_single_channel()
         exp = self.expanded()
         return plot_cartesian(
-            thetas=exp.thetas, phis=exp.phis, values=exp.values, **kwargs
+            thetas=exp.thetas,
+            phis=exp.phis,
+            values=exp.values,
+            max_points=max_points,
+            **kwargs,
         )
 
     @staticmethod
@@ -239,22 +526,112 @@ class Photometry:
     # ------------------ Internals ------------------
 
     def _make_coords(self):
-        """generate cartesian coordinates for plotting purposes"""
+        """
+        generate cartesian coordinates for plotting purposes. they are
+        shared, read-only, with every photometry on the same grid
+        """
         exp = self.expanded()
-        tgrid, pgrid = np.meshgrid(exp.thetas, exp.phis)
-        tflat, pflat = tgrid.flatten(), pgrid.flatten()
-        x, y, z = self.to_cartesian(tflat, pflat, 1)
-        return np.array([x, y, -z]).T
+        return direction_table(exp.thetas, exp.phis).flat(self.dtype)
 
     def _make_photometric_coords(self):
         """generate value-scaled cartesian coordinates for plotting purposes"""
+        self._check_single_channel()
         exp = self.expanded()
-        tgrid, pgrid = np.meshgrid(exp.thetas, exp.phis)
-        tflat, pflat = tgrid.flatten(), pgrid.flatten()
-        xp, yp, zp = exp.to_cartesian(tflat, pflat, exp.values.flatten())
-        return np.array([xp, yp, -zp]).T
+        coords = direction_table(exp.thetas, exp.phis).flat(self.dtype)
+        return coords * exp.values.reshape(-1, 1)
+
+    def _rescale(self, factor):
+        """
+        multiply the values, and those of cached derived photometries, by
+        `factor(photometry)`, dropping caches that depend on the values.
+        cached photometries may be shared with clones, so they are replaced
+        by rescaled copies rather than modified. the new cache is swapped in
+        whole, so concurrent readers never see a partly rescaled one
+        """
+        with self._lock:
+            cache = {}
+            for key, item in self._cache.items():
+                if key in ("fingerprint", "pcoords"):
+                    continue
+                if isinstance(item, Photometry):
+                    item = item.copy()
+                    item._rescale(factor)
+                    item._freeze()
+                cache[key] = item
+            if outofcore.is_memmap(self.values):
+                self.values = outofcore.scaled(self.values, factor(self))
+            else:
+                self.values = (self.values * factor(self)).astype(self.dtype)
+            self._cache = cache
+        return self.values
+
+    def _cached(self, key, factory):
+        """
+        return the derived product cached under `key`, computing it with
+        `factory()` if needed. computation is single-flight: concurrent
+        callers wait for the first one rather than repeating its work.
+        cached photometries are made read-only, since clones share them
+        """
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        with self._lock:
+            try:
+                return self._cache[key]
+            except KeyError:
+                item = factory()
+                if isinstance(item, Photometry):
+                    item._freeze()
+                self._cache[key] = item
+                return item
+
+    def _freeze(self):
+        """
+        make the angle and value arrays read-only. read-only views are taken
+        so that arrays shared with the photometry this one was derived from
+        stay writable there; the cache still matches the arrays
+        """
+        for name in ("thetas", "phis", "values"):
+            arr = getattr(self, name)
+            if arr.flags.writeable:
+                arr = arr.view()
+                arr.flags.writeable = False
+                object.__setattr__(self, name, arr)
+
+    def _decimation_error(self, keep_t, keep_p):
+        """
+        absolute error at every grid point when the values are reconstructed
+        bilinearly from only the kept angles
+        """
+        sub = self.values[np.ix_(keep_p, keep_t)]
+        extra = (1,) * (self.values.ndim - 2)
+
+        rec = sub
+        if len(self.thetas) > 1:
+            ti, tw = linear_weights(self.thetas[keep_t], self.thetas)
+            tw = tw.reshape((1, -1) + extra)
+            rec = rec[:, ti - 1] * (1 - tw) + rec[:, ti] * tw
+
+        if len(self.phis) > 1:  # a single (axial) plane needs no phi pass
+            pi, pw = linear_weights(self.phis[keep_p], self.phis)
+            pw = pw.reshape((-1, 1) + extra)
+            rec = rec[pi - 1] * (1 - pw) + rec[pi] * pw
+
+        err = np.abs(rec - self.values)
+        return err.reshape(err.shape[:2] + (-1,)).max(axis=2)
+
+    def _check_single_channel(self):
+        if self.is_multichannel:
+            raise ValueError(
+                "operation requires a single channel; select one with .channel()"
+            )
 
     def _infer_symmetry(self):
+        """
+        symmetry declared by the horizontal angles; hidden symmetry in
+        the values is found by `detect_symmetry`
+        """
 
         if self.photometric_type == PhotometricType.C:
             if not np.isclose(self.phis[0], 0):
@@ -276,81 +653,152 @@ class Photometry:
 
     def _expand_angles(self):
         """return a photometry with fully mirrored values"""
-        if self.photometric_type == PhotometricType.C:
-            if self.symmetry == LampSymmetry.AXIAL:  # C0
-                phis = np.arange(0, 360)
-                values = np.tile(self.values, 360).reshape(-1, 360)
-            elif self.symmetry == LampSymmetry.QUAD:  # C90
-                phis1 = self.phis
-                phis2 = phis1[1:] + 90
-                phis3 = phis1[1:] + 180
-                phis4 = phis1[1:] + 270
-                phis = np.concatenate((phis1, phis2, phis3, phis4))
-
-                vals1 = self.values[:-1]
-                vals2 = np.flip(self.values, axis=0)
-                vals3 = np.concatenate((vals1, vals2))
-                vals4 = np.flip(vals3[:-1], axis=0)
-                values = np.concatenate((vals3, vals4))
-
-            elif self.symmetry == LampSymmetry.HALF:  # C180
-                phis1 = self.phis
-                phis2 = phis[1:] + 180
-                phis = np.concatenate((phis1, phis2))
-                vals1 = self.values[:-1]
-                vals2 = np.flip(self.values, axis=0)
-                values = np.concatenate((vals1, vals2))
-            elif self.symmetry == LampSymmetry.NONE:
-                phis = self.phis
-                values = self.values
-            else:
-                raise NotImplementedError(
-                    f"Lamp symmetry {self.symmetry} is not supported"
-                )
-
-            # fill in thetas
-            if np.isclose(self.thetas[-1], 90):
-                val = self.thetas[-1]
-                step = self.thetas[-1] - self.thetas[-2]
-                extrathetas = []
-                while val < 180:
-                    val = val + step
-                    extrathetas.append(val)
-                extravals = np.zeros((len(phis), len(extrathetas)))
-
-                thetas = np.concatenate((self.thetas, extrathetas))
-                values = np.concatenate((values.T, extravals.T)).T
-
-            else:
-                thetas = self.thetas
-
+        thetas, phis, rows = self._expansion()
+        if outofcore.is_memmap(self.values):
+            values = outofcore.gather_rows(self.values, rows, len(thetas))
         else:
-            raise NotImplementedError("A and B photometries are not yet supported")
+            values = self.values[rows]
+            if len(thetas) > len(self.thetas):  # zeros for the filled-in thetas
+                extravals = np.zeros(
+                    (len(phis), len(thetas) - len(self.thetas)) + values.shape[2:]
+                )
+                values = np.concatenate((values, extravals), axis=1)
 
         return Photometry(
             thetas=thetas,
             phis=phis,
             values=values,
             photometric_type=self.photometric_type,
+            dtype=self.dtype,
         )
 
+    def _expansion(self):
+        """
+        angles of the fully mirrored photometry, and the row of values each
+        of its rows is copied from. thetas beyond the original ones are zero
+        """
+        if self.photometric_type != PhotometricType.C:
+            raise NotImplementedError("A and B photometries are not yet supported")
+
+        rows = np.arange(len(self.phis))
+        if self.symmetry == LampSymmetry.AXIAL:  # C0
+            phis = np.arange(0, 361)
+            rows = np.zeros(len(phis), dtype=int)
+        elif self.symmetry == LampSymmetry.QUAD:  # C90
+            phis, rows = _mirror(self.phis, rows, 90)
+            phis, rows = _mirror(phis, rows, 180)
+        elif self.symmetry == LampSymmetry.HALF:  # C180
+            phis, rows = _mirror(self.phis, rows, 180)
+        elif self.symmetry == LampSymmetry.NONE:
+            phis = self.phis
+        else:
+            raise NotImplementedError(f"Lamp symmetry {self.symmetry} is not supported")
+
+        # fill in thetas
+        if np.isclose(self.thetas[-1], 90):
+            step = self.thetas[-1] - self.thetas[-2]
+            extrathetas = np.arange(self.thetas[-1] + step, 180 - step / 2, step)
+            extrathetas = np.append(extrathetas, 180.0)
+            thetas = np.concatenate((self.thetas, extrathetas))
+        else:
+            thetas = self.thetas
+        return thetas, phis, rows
+
     def _interpolate_angles(self, num_thetas=181, num_phis=361):
         """return a photometry fully filled out"""
 
-        expanded = self.expanded()
-
         new_thetas = np.linspace(0, 180, num_thetas)
         new_phis = np.linspace(0, 360, num_phis)
 
-        tgrid, pgrid = np.meshgrid(new_thetas, new_phis)
-        tflat, pflat = tgrid.flatten(), pgrid.flatten()
+        if outofcore.is_memmap(self.values):
+            return self._interpolate_blocks(new_thetas, new_phis)
+        return self.regridded(new_thetas, new_phis)
 
-        intensity = expanded.get_intensity(tflat, pflat)
-        newvalues = intensity.reshape(num_phis, num_thetas)
+    def _interpolate_blocks(self, thetas, phis):
+        """interpolate memmap-backed values a block of output rows at a time"""
+        exp = self.expanded()
+        shape = (len(phis), len(thetas)) + exp.values.shape[2:]
+        row_nbytes = int(np.prod(shape[1:])) * self.dtype.itemsize
 
+        def interpolate(rows):
+            tgrid, pgrid = np.meshgrid(thetas, phis[rows])
+            weights = bilinear_weights(exp.thetas, exp.phis, tgrid, pgrid)
+            return bilinear_interpolate(exp.values, *weights)
+
+        values = outofcore.map_rows(interpolate, shape, row_nbytes, self.dtype)
         return Photometry(
-            thetas=new_thetas,
-            phis=new_phis,
-            values=newvalues,
-            photometric_type=expanded.photometric_type,
+            thetas=thetas,
+            phis=phis,
+            values=values,
+            photometric_type=self.photometric_type,
+            dtype=self.dtype,
         )
+
+
+def _check_dtype(dtype):
+    dtype = _config["dtype"] if dtype is None else np.dtype(dtype)
+    if dtype not in _DTYPES:
+        raise ValueError(f"unsupported photometry dtype {dtype}")
+    return dtype
+
+
+def _mirror(phis, values, about):
+    """reflect horizontal angles and their values about the angle `about`"""
+    phis = np.concatenate((phis, 2 * about - phis[-2::-1]))
+    values = np.concatenate((values, values[-2::-1]))
+    return phis, values
+
+
+def _worst_per_gap(err, keep, tol):
+    """mask of the largest error above `tol` between each pair of kept angles"""
+    gap = np.cumsum(keep)
+    order = np.lexsort((-err, gap))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = gap[order][1:] != gap[order][:-1]
+    worst = order[first]
+    mask = np.zeros(len(keep), dtype=bool)
+    mask[worst[err[worst] > tol]] = True
+    return mask
+
+
+def _is_mirrored(phis, span):
+    """whether the horizontal angles are symmetric about span / 2"""
+    return np.isclose(phis[-1], span) and np.allclose(span - phis[::-1], phis)
+
+
+def _mirror_close(values, tol):
+    """whether rows of values match their mirror images within tol"""
+    return np.abs(values - values[::-1]).max() <= tol
+
+
+def _fingerprint(phot):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(int(phot.photometric_type).to_bytes(1, "little"))
+    for arr in (phot.thetas, phot.phis, phot.values):
+        digest.update(str(np.shape(arr)).encode())
+        for block in outofcore.iter_row_blocks(arr):
+            # + 0.0 turns -0.0 into 0.0 so that equal arrays digest equally
+            block = np.ascontiguousarray(block, dtype=np.float64) + 0.0
+            digest.update(block.tobytes())
+    return digest.hexdigest()
+
+
+_CACHE_KINDS = {
+    "all": lambda key: key != "fingerprint",
+    "expanded": lambda key: key == "expanded",
+    "interp": lambda key: isinstance(key, tuple) and key[0] == "interpolated",
+    "coords": lambda key: key in ("coords", "pcoords"),
+}
+
+
+def _cache_name(key):
+    """readable name for a cache key"""
+    if isinstance(key, tuple):
+        return f"{key[0]}{key[1:]}"
+    return key
+
+
+def _nbytes(item):
+    if isinstance(item, np.ndarray):
+        return item.nbytes
+    return sys.getsizeof(item)
@@ -4,7 +4,9 @@ from pathlib import Path
 import pathlib
 import warnings
 from .interpolate import interpolate_values
-from .read import read_ies_data
+from .directions import direction_table
+
+MAX_PLOT_POINTS = 20_000  # default point budget of 3d cartesian plots
 
 
 def plot_ies(
@@ -59,8 +61,8 @@ def plot_ies(
     DATA_TYPE = None
     if isinstance(fdata, (str, pathlib.PosixPath, bytes)):
         if Path(fdata).is_file():
-            DATA_TYPE = "FILE"
-            lampdict = read_ies_data(fdata)
+            DATA_TYPE = "VALDICT"
+            valdict = _file_valdict(fdata, which.lower())
     elif isinstance(fdata, dict):
         lampdict_keys = [
             "source",
@@ -122,6 +124,18 @@ def plot_ies(
     return fig, ax
 
 
+def _file_valdict(filename, which):
+    """value dictionary of a file, computing only the requested values"""
+    from .calculate import _read_cached
+
+    phot = _read_cached(filename).photometry
+    if which == "full":
+        phot = phot.expanded()
+    elif which == "interpolated":
+        phot = phot.interpolated()
+    return {"thetas": phot.thetas, "phis": phot.phis, "values": phot.values}
+
+
 def plot_valdict_polar(valdict, title="", figsize=(6.4, 4.8)):
 
     thetas = valdict["thetas"]
@@ -213,6 +227,7 @@ def plot_valdict_cartesian(
     show_cbar=False,
     alpha=0.7,
     cmap="rainbow",
+    max_points=None,
 ):
     """
     valdict: dictionary containing thetas, phis, and the candela values
@@ -222,6 +237,8 @@ def plot_valdict_cartesian(
     figsize: alter figure size  (default=(6,4))
     alpha: transparency, 0-1 (default=0.7)
     cmap: colormap keyword (default='rainbow')
+    max_points: decimate larger grids to about this many points before
+        plotting (default=MAX_PLOT_POINTS)
 
     TODO: make it possible to pass fig, ax arguments to this function
     """
@@ -254,6 +271,7 @@ def plot_valdict_cartesian(
         show_cbar=show_cbar,
         alpha=alpha,
         cmap=cmap,
+        max_points=max_points,
     )
 
 
@@ -268,10 +286,13 @@ def plot_cartesian(
     show_cbar=False,
     alpha=0.7,
     cmap="rainbow",
+    max_points=None,
 ):
 
-    x, y, z = get_coords(thetas, phis, which="cartesian")
-    intensity = values.flatten()
+    rows, cols = _plot_subgrid(values, max_points)
+    vectors = direction_table(thetas, phis).vectors[np.ix_(rows, cols)]
+    x, y, z = vectors.reshape(-1, 3).T
+    intensity = values[np.ix_(rows, cols)].flatten()
 
     # plot
     fig = plt.figure(figsize=figsize)
@@ -292,6 +313,32 @@ def plot_cartesian(
     return fig, ax
 
 
+def _plot_subgrid(values, max_points=None):
+    """
+    row (phi) and column (theta) indices of a subgrid of `values` with
+    about `max_points` points, for plotting. angles are kept at even
+    strides, together with the first and last ones, which hold the
+    outline, and those through the maximum, which hold the peak
+    """
+    if max_points is None:
+        max_points = MAX_PLOT_POINTS
+    num_phis, num_thetas = values.shape[:2]
+    if values.size <= max_points:
+        return np.arange(num_phis), np.arange(num_thetas)
+    peak = np.unravel_index(np.argmax(values), values.shape[:2])
+    ratio = np.sqrt(values.size / max_points)
+    return tuple(
+        _strided(n, ratio, keep) for n, keep in zip((num_phis, num_thetas), peak)
+    )
+
+
+def _strided(n, ratio, keep):
+    """about n / ratio evenly strided indices up to n, including `keep`"""
+    count = max(2, int(n / ratio) - 1)  # one left for `keep`
+    indices = np.round(np.linspace(0, n - 1, count)).astype(int)
+    return np.union1d(indices, [keep])
+
+
 def get_coords(thetas, phis, which="cartesian"):
     """
     Get an ordered pair of lists of coordinates.
@@ -305,14 +352,12 @@ def get_coords(thetas, phis, which="cartesian"):
             "Invalid coordinate type: must be either `polar` or `cartesian`"
         )
 
-    tgrid, pgrid = np.meshgrid(thetas, phis)
-    tflat, pflat = tgrid.flatten(), pgrid.flatten()
-
     if which.lower() == "cartesian":
-        coordslist = [polar_to_cartesian(t, p) for t, p in zip(tflat, pflat)]
-        coords = np.array(coordslist).T
+        # same as polar_to_cartesian at every grid point, from a shared table
+        coords = direction_table(thetas, phis).flat().T.copy()
     elif which.lower() == "polar":
-        coords = np.array([tflat, pflat])
+        tgrid, pgrid = np.meshgrid(thetas, phis)
+        coords = np.array([tgrid.flatten(), pgrid.flatten()])
 
     return coords
 
@@ -0,0 +1,132 @@
+"""
+Lightweight instrumentation of the read/compute pipeline.
+
+Pipeline stages are wrapped in named spans. When no hook is registered,
+`span` returns a shared no-op object, so instrumentation costs a function
+call and a truthiness check. Registered hooks receive every finished Span,
+with its name, duration in seconds, and any counts (bytes, elements...)
+attached to it.
+
+    with profile() as prof:
+        IESFile.read(path).photometry.interpolated()
+    print(prof.table())
+"""
+
+import time
+
+_hooks = []
+
+
+class Span:
+    """a timed pipeline stage"""
+
+    __slots__ = ("name", "counts", "start", "duration")
+
+    def __init__(self, name, counts):
+        self.name = name
+        self.counts = counts
+        self.start = None
+        self.duration = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.duration = time.perf_counter() - self.start
+        for hook in list(_hooks):
+            hook(self)
+        return False
+
+    def add(self, **counts):
+        """attach counts discovered while the stage runs"""
+        self.counts.update(counts)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, **counts):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, **counts):
+    """return a context manager timing the stage `name`"""
+    if not _hooks:
+        return _NULL_SPAN
+    return Span(name, counts)
+
+
+def add_hook(callback):
+    """register `callback(span)` to be called as each span finishes"""
+    _hooks.append(callback)
+
+
+def remove_hook(callback):
+    _hooks.remove(callback)
+
+
+class Profile:
+    """
+    hook that records spans, and aggregates them into a summary. use as a
+    context manager to register it for the duration of a block
+    """
+
+    def __init__(self):
+        self.spans = []
+
+    def __call__(self, span):
+        self.spans.append((span.name, span.duration, dict(span.counts)))
+
+    def __enter__(self):
+        add_hook(self)
+        return self
+
+    def __exit__(self, *exc):
+        remove_hook(self)
+        return False
+
+    def summary(self):
+        """return {name: {"calls", "total", "mean", "max", **summed counts}}"""
+        summary = {}
+        for name, duration, counts in self.spans:
+            row = summary.setdefault(name, {"calls": 0, "total": 0.0, "max": 0.0})
+            row["calls"] += 1
+            row["total"] += duration
+            row["max"] = max(row["max"], duration)
+            for key, val in counts.items():
+                if isinstance(val, (int, float)) and not isinstance(val, bool):
+                    row[key] = row.get(key, 0) + val
+        for row in summary.values():
+            row["mean"] = row["total"] / row["calls"]
+        return summary
+
+    def table(self):
+        """return the summary as a text table, slowest stages first"""
+        summary = self.summary()
+        lines = [f"{'stage':28s} {'calls':>6s} {'total ms':>10s} {'mean ms':>10s}  counts"]
+        for name, row in sorted(summary.items(), key=lambda kv: -kv[1]["total"]):
+            counts = ", ".join(
+                f"{k}={v}"
+                for k, v in row.items()
+                if k not in ("calls", "total", "mean", "max")
+            )
+            lines.append(
+                f"{name:28s} {row['calls']:6d} {row['total'] * 1e3:10.3f} "
+                f"{row['mean'] * 1e3:10.3f}  {counts}"
+            )
+        return "\n".join(lines)
+
+
+def profile():
+    """return a new Profile; use as `with profile() as prof:`"""
+    return Profile()
@@ -5,6 +5,7 @@ import warnings
 import numpy as np
 from collections import Counter
 from .interpolate import interpolate_values
+from .archive import read_member
 
 
 def _get_max_path() -> int:
@@ -128,7 +129,10 @@ def load_bytes(src, *, encoding: str = "utf-8"):
 def _read_file(src):
     p = Path(src)
     if not p.is_file():
-        raise FileNotFoundError("Invalid path")
+        raw = read_member(p)  # a file inside an archive?
+        if raw is None:
+            raise FileNotFoundError("Invalid path")
+        return raw, p
     return p.read_bytes(), p
 
 
@@ -243,22 +247,24 @@ def process_header(data):
 
 def read_angles(data, num_thetas, num_phis):
 
+    # convert all numbers in one pass
+    num_values = num_thetas * num_phis
+    nums = np.array(data[: num_thetas + num_phis + num_values], dtype=np.float64)
+
     # read vertical angles
     v_start = 0
     v_end = num_thetas
-    thetas = np.array(list(map(float, data[v_start:v_end])))
+    thetas = nums[v_start:v_end]
 
     # read horizontal angles
     h_start = v_end
     h_end = h_start + num_phis
-    phis = np.array(list(map(float, data[h_start:h_end])))
+    phis = nums[h_start:h_end]
 
     # read values (1d and 2d)
     val_start = h_end
-    num_values = num_thetas * num_phis
     val_end = val_start + num_values
-    vals = data[val_start:val_end]
-    values = np.array(list(map(float, vals)))
+    values = nums[val_start:val_end]
     values = values.reshape(num_phis, num_thetas)
 
     return thetas, phis, values
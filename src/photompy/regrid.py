@@ -0,0 +1,193 @@
+from collections import OrderedDict
+import hashlib
+import threading
+import numpy as np
+from .interpolate import bilinear_weights
+
+
+def grid_signature(*arrays):
+    """
+    return a compact, hashable key identifying a set of angle arrays by
+    their content, suitable for keying caches shared between lamps
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for arr in arrays:
+        arr = np.ascontiguousarray(arr, dtype=np.float64)
+        digest.update(str(arr.shape).encode())
+        digest.update(arr.tobytes())
+    return digest.hexdigest()
+
+
+class GridCache:
+    """
+    small thread-safe LRU cache for objects derived only from an angle grid
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get_or_create(self, key, factory):
+        """return the cached item for `key`, building it with `factory()`"""
+        with self._lock:
+            try:
+                self._items.move_to_end(key)
+                return self._items[key]
+            except KeyError:
+                pass
+        item = factory()
+        with self._lock:
+            item = self._items.setdefault(key, item)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return item
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class RegridOperator:
+    """
+    Bilinear interpolation from a source angle grid onto target angles,
+    stored as a sparse matrix with four nonzeros per target point.
+
+    The operator depends only on the grids, so it can be built once and
+    applied to every photometry (or stack of value arrays) that shares the
+    source grid.
+
+    src_thetas, src_phis: angles of the source grid
+    thetas, phis: target angles. If `grid` is True, they are the axes of
+        the target grid; otherwise they are broadcast against each other as
+        individual points.
+    """
+
+    def __init__(self, src_thetas, src_phis, thetas, phis, grid=True):
+        self.src_thetas = np.asarray(src_thetas, dtype=np.float64)
+        self.src_phis = np.asarray(src_phis, dtype=np.float64)
+        self.grid = grid
+
+        if grid:
+            self.thetas = np.asarray(thetas, dtype=np.float64)
+            self.phis = np.asarray(phis, dtype=np.float64)
+            tgrid, pgrid = np.meshgrid(self.thetas, self.phis)
+        else:
+            try:
+                tgrid, pgrid = np.broadcast_arrays(
+                    np.asarray(thetas, dtype=np.float64),
+                    np.asarray(phis, dtype=np.float64),
+                )
+            except ValueError as e:
+                raise ValueError(
+                    "theta and phi shapes are not broadcast-compatible"
+                ) from e
+            self.thetas, self.phis = tgrid, pgrid
+
+        if np.any(tgrid < 0) or np.any(tgrid > 180):
+            raise ValueError("Theta values must be between 0 and 180 degrees")
+
+        self.shape = tgrid.shape
+        pi, ti, pw, tw = bilinear_weights(
+            self.src_thetas, self.src_phis, tgrid.ravel(), pgrid.ravel()
+        )
+        num = len(self.src_thetas)
+        self.indices = np.stack(
+            [
+                (pi - 1) * num + ti - 1,
+                pi * num + ti - 1,
+                (pi - 1) * num + ti,
+                pi * num + ti,
+            ]
+        )
+        self.weights = np.stack(
+            [
+                (1 - pw) * (1 - tw),
+                pw * (1 - tw),
+                (1 - pw) * tw,
+                pw * tw,
+            ]
+        )
+
+    @property
+    def src_shape(self):
+        """shape of value arrays this operator accepts"""
+        return (len(self.src_phis), len(self.src_thetas))
+
+    @property
+    def nnz(self):
+        """number of stored nonzero weights"""
+        return self.weights.size
+
+    def matches(self, thetas, phis):
+        """whether the given angles are this operator's source grid"""
+        return np.array_equal(thetas, self.src_thetas) and np.array_equal(
+            phis, self.src_phis
+        )
+
+    def apply(self, data):
+        """
+        regrid `data`, which is either a Photometry on the source grid (or
+        whose expanded form is on the source grid), or an array of shape
+        (..., num_phis, num_thetas). Leading axes of an array are treated
+        as a stack of lamps and all regridded in the same product.
+        """
+        from .photometry import Photometry  # avoid circular import
+
+        if isinstance(data, Photometry):
+            phot = data
+            if not self.matches(phot.thetas, phot.phis):
+                phot = phot.expanded()
+                if not self.matches(phot.thetas, phot.phis):
+                    raise ValueError("photometry is not on the source grid")
+            if phot.is_multichannel:
+                # channels are moved to the front to be regridded as a stack
+                values = np.moveaxis(
+                    self.apply(np.moveaxis(phot.values, 2, 0)), 0, -1
+                )
+            else:
+                values = self.apply(phot.values)
+            if not self.grid:
+                return values
+            return Photometry(
+                thetas=self.thetas,
+                phis=self.phis,
+                values=values,
+                photometric_type=phot.photometric_type,
+                dtype=phot.dtype,
+            )
+
+        values = np.asarray(data)
+        if values.shape[-2:] != self.src_shape:
+            raise ValueError(
+                f"values shape {values.shape} does not end with source grid "
+                f"shape {self.src_shape}"
+            )
+        flat = values.reshape(*values.shape[:-2], -1)
+        out = flat[..., self.indices[0]] * self.weights[0]
+        for idx, wt in zip(self.indices[1:], self.weights[1:]):
+            out += flat[..., idx] * wt
+        return out.reshape(*values.shape[:-2], *self.shape)
+
+    __call__ = apply
+
+
+_OPERATORS = GridCache(maxsize=32)
+
+
+def regrid_operator(src_thetas, src_phis, thetas, phis, grid=True):
+    """
+    return a RegridOperator from the source grid onto the target angles,
+    reusing a previously built operator for the same grids if possible
+    """
+    key = (grid_signature(src_thetas, src_phis, thetas, phis), grid)
+    return _OPERATORS.get_or_create(
+        key, lambda: RegridOperator(src_thetas, src_phis, thetas, phis, grid=grid)
+    )
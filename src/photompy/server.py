@@ -0,0 +1,355 @@
+"""
+Local evaluation server.
+
+Loads a set of lamps once and answers intensity and irradiance queries over
+HTTP on localhost, or on a Unix socket. Concurrent requests for the same
+lamp that arrive within `window` seconds of each other are coalesced into
+one vectorized get_intensity call, and the results scattered back.
+
+    GET  /lamps                 names and symmetry of the loaded lamps
+    GET  /metrics               request latency and batch size statistics
+    POST /intensity             {"lamp", "theta", "phi"} -> {"values"}
+    POST /irradiance            {"lamp", "points", ["normals"]} -> {"values"}
+
+Irradiance points are (x, y, z) positions in the lamp's frame, in the
+photometric convention where theta = 0 points along -z. Without normals,
+surfaces are assumed to face the lamp.
+"""
+
+import asyncio
+import json
+import pathlib
+import time
+from collections import defaultdict
+import numpy as np
+from .ies import IESFile
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+}
+_MAX_BODY = 64 * 2**20
+
+
+class UnknownLampError(LookupError):
+    """a request named a lamp the server does not have"""
+
+
+class Metrics:
+    """request latencies and batch sizes, kept per endpoint"""
+
+    def __init__(self, keep=10_000):
+        self.keep = keep
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.batch_sizes = []
+        self.batch_points = []
+
+    def record_request(self, endpoint, seconds, ok=True):
+        latencies = self.latencies[endpoint]
+        latencies.append(seconds)
+        del latencies[: -self.keep]
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def record_batch(self, requests, points):
+        self.batch_sizes.append(requests)
+        self.batch_points.append(points)
+        del self.batch_sizes[: -self.keep]
+        del self.batch_points[: -self.keep]
+
+    def summary(self):
+        """return latency percentiles (ms) per endpoint and batch statistics"""
+        requests = {}
+        for endpoint, latencies in self.latencies.items():
+            ms = np.asarray(latencies) * 1e3
+            requests[endpoint] = {
+                "count": len(ms),
+                "errors": self.errors[endpoint],
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+                "max_ms": float(ms.max()),
+            }
+        sizes = np.asarray(self.batch_sizes)
+        batches = {"count": len(sizes)}
+        if len(sizes):
+            batches.update(
+                mean_requests=float(sizes.mean()),
+                max_requests=int(sizes.max()),
+                mean_points=float(np.mean(self.batch_points)),
+            )
+        return {"requests": requests, "batches": batches}
+
+
+class _Batcher:
+    """coalesces intensity evaluations for one lamp"""
+
+    def __init__(self, photometry, window, metrics):
+        self.photometry = photometry
+        self.window = window
+        self.metrics = metrics
+        self._pending = []
+        self._tasks = set()
+
+    async def evaluate(self, theta, phi):
+        theta, phi = np.broadcast_arrays(theta, phi)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((theta, phi, future))
+        if len(self._pending) == 1:
+            self._spawn(self._flush())
+        return await future
+
+    def _spawn(self, coro):
+        # the loop only keeps weak references to tasks
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self):
+        await asyncio.sleep(self.window)
+        batch, self._pending = self._pending, []
+        thetas = np.concatenate([theta.ravel() for theta, _, _ in batch])
+        phis = np.concatenate([phi.ravel() for _, phi, _ in batch])
+        self.metrics.record_batch(len(batch), len(thetas))
+        try:
+            values = await self.photometry.aget_intensity(thetas, phis)
+        except Exception as e:
+            # one bad request fails the batch; retry each alone so the
+            # error reaches only the requests that caused it
+            if len(batch) == 1:
+                if not batch[0][2].done():
+                    batch[0][2].set_exception(e)
+                return
+            values = None
+        stop = 0
+        for theta, phi, future in batch:
+            start, stop = stop, stop + theta.size
+            if future.done():  # cancelled while waiting
+                continue
+            if values is not None:
+                chunk = values[start:stop]
+                future.set_result(chunk.reshape(theta.shape + chunk.shape[1:]))
+            else:
+                self._retry(theta, phi, future)
+
+    def _retry(self, theta, phi, future):
+        async def run():
+            try:
+                result = await self.photometry.aget_intensity(theta, phi)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+        self._spawn(run())
+
+
+class Server:
+    """
+    Evaluation server for a mapping of names to IESFile objects. Use
+    `await server.start()` to listen, and `await server.close()` to stop.
+
+    host, port: TCP address; port 0 picks a free port
+    unix_path: listen on this Unix socket instead of TCP
+    window: seconds to wait for more requests before evaluating a batch
+    """
+
+    def __init__(
+        self, lamps, host="127.0.0.1", port=8765, unix_path=None, window=0.001
+    ):
+        self.lamps = dict(lamps)
+        self.host, self.port, self.unix_path = host, port, unix_path
+        self.metrics = Metrics()
+        # evaluate on the fully mirrored photometry, so angles outside the
+        # measured range of a symmetric lamp are mirrored, not extrapolated
+        self._batchers = {
+            name: _Batcher(ies.photometry.expanded(), window, self.metrics)
+            for name, ies in self.lamps.items()
+        }
+        self._server = None
+
+    @classmethod
+    async def from_files(cls, paths, strict=True, **kwargs):
+        """load files, named by their stem, and return a server for them"""
+        paths = [pathlib.Path(p) for p in paths]
+        names = [p.stem for p in paths]
+        if len(set(names)) != len(names):
+            raise ValueError("lamp file names must be unique")
+        files = await IESFile.aread_many(paths, strict=strict)
+        return cls(dict(zip(names, files)), **kwargs)
+
+    @property
+    def address(self):
+        """the bound (host, port), or the Unix socket path"""
+        if self.unix_path is not None:
+            return str(self.unix_path)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self):
+        if self.unix_path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle, path=self.unix_path
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self._handle, host=self.host, port=self.port
+            )
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    # ---------------- Endpoints -----------------------
+
+    def lamps_info(self):
+        return {
+            name: {
+                "symmetry": ies.photometry.symmetry.value,
+                "num_channels": ies.photometry.num_channels,
+            }
+            for name, ies in self.lamps.items()
+        }
+
+    async def intensity(self, body):
+        batcher = self._batcher(body)
+        theta = np.asarray(body["theta"], dtype=np.float64)
+        phi = np.asarray(body["phi"], dtype=np.float64)
+        return {"values": (await batcher.evaluate(theta, phi)).tolist()}
+
+    async def irradiance(self, body):
+        batcher = self._batcher(body)
+        points = np.asarray(body["points"], dtype=np.float64).reshape(-1, 3)
+        dist = np.linalg.norm(points, axis=1)
+        if np.any(dist == 0):
+            raise ValueError("points must not coincide with the lamp")
+        unit = points / dist[:, None]
+        theta = np.degrees(np.arccos(np.clip(-unit[:, 2], -1, 1)))
+        phi = np.degrees(np.arctan2(unit[:, 0], unit[:, 1])) % 360
+        cosine = np.ones_like(dist)
+        if body.get("normals") is not None:
+            normals = np.asarray(body["normals"], dtype=np.float64).reshape(-1, 3)
+            normals = normals / np.linalg.norm(normals, axis=1, keepdims=True)
+            cosine = np.clip(-(normals * unit).sum(axis=1), 0, None)
+        values = await batcher.evaluate(theta, phi)
+        scale = cosine / dist**2
+        scale = scale.reshape(scale.shape + (1,) * (values.ndim - 1))  # channels
+        return {"values": (values * scale).tolist()}
+
+    # ---------------- Internals -----------------------
+
+    def _batcher(self, body):
+        name = body["lamp"]
+        try:
+            return self._batchers[name]
+        except KeyError:
+            raise UnknownLampError(f"unknown lamp {name!r}") from None
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ValueError as e:
+                    # the stream can't be trusted after a malformed request
+                    error = {"error": f"malformed request: {e}"}
+                    _write_response(writer, 400, error, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                start = time.perf_counter()
+                status, payload = await self._dispatch(method, path, body)
+                self.metrics.record_request(
+                    path, time.perf_counter() - start, ok=status == 200
+                )
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, body):
+        routes = {
+            ("GET", "/lamps"): lambda: self.lamps_info(),
+            ("GET", "/metrics"): lambda: self.metrics.summary(),
+        }
+        posts = {"/intensity": self.intensity, "/irradiance": self.irradiance}
+        try:
+            if (method, path) in routes:
+                return 200, routes[method, path]()
+            if path in posts:
+                if method != "POST":
+                    return 405, {"error": f"{path} expects POST"}
+                return 200, await posts[path](json.loads(body or b"{}"))
+            return 404, {"error": f"no such endpoint {path}"}
+        except UnknownLampError as e:
+            return 404, {"error": str(e)}
+        except KeyError as e:
+            return 400, {"error": f"missing field {e}"}
+        except (ValueError, TypeError) as e:
+            return 400, {"error": f"{type(e).__name__}: {e}"}
+
+
+async def _read_request(reader):
+    """parse one HTTP/1.1 request; returns None at end of stream"""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    method, target, version = line.decode("latin-1").split()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > _MAX_BODY:
+        raise ConnectionError("request body too large")
+    body = await reader.readexactly(length) if length else b""
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" and (
+        version == "HTTP/1.1" or connection == "keep-alive"
+    )
+    return method, target.split("?")[0], body, keep_alive
+
+
+def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode() + body)
+
+
+def serve(paths, strict=True, **kwargs):
+    """load files and serve them until interrupted"""
+
+    async def run():
+        server = await Server.from_files(paths, strict=strict, **kwargs)
+        await server.start()
+        print(f"serving {len(server.lamps)} lamps on {server.address}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
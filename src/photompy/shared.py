@@ -0,0 +1,140 @@
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+from .ies import IESFile
+from .photometry import Photometry
+
+_ALIGN = 64
+
+
+class SharedLampSet:
+    """
+    The angle and value arrays of many IESFile objects, placed in a single
+    multiprocessing.shared_memory block.
+
+    A SharedLampSet pickles as a small handle (the block name, the array
+    layout and the headers), so worker processes that receive it attach to
+    the same memory instead of unpickling copies of every array. The lamps
+    it hands out are backed by read-only views of the block; scaling them
+    creates private copies as usual.
+
+    The creating process owns the block: use the set as a context manager,
+    or call `close()` and `unlink()`, once workers are done with it.
+    """
+
+    def __init__(self, files):
+        files = list(files)
+        layout, offset = [], 0
+        for ies in files:
+            phot = ies.photometry
+            arrays = []
+            dtypes = (np.float64, np.float64, phot.dtype)
+            for arr, dtype in zip((phot.thetas, phot.phis, phot.values), dtypes):
+                arr = np.asarray(arr, dtype=dtype)
+                arrays.append((offset, arr.shape, np.dtype(dtype).str))
+                offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+            layout.append(
+                (arrays, phot.photometric_type, ies.header, _source_name(ies.source))
+            )
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self._owner = True
+        self._layout = layout
+        self._files = None
+        for ies, (arrays, *_) in zip(files, layout):
+            phot = ies.photometry
+            for (start, shape, dtype), arr in zip(
+                arrays, (phot.thetas, phot.phis, phot.values)
+            ):
+                view = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=start)
+                view[...] = arr
+
+    def __getstate__(self):
+        return {"name": self._shm.name, "layout": self._layout}
+
+    def __setstate__(self, state):
+        self._shm = _attach(state["name"])
+        self._owner = False
+        self._layout = state["layout"]
+        self._files = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    def __len__(self):
+        return len(self._layout)
+
+    def __getitem__(self, index):
+        return self.files()[index]
+
+    def __iter__(self):
+        return iter(self.files())
+
+    @property
+    def name(self):
+        """name of the shared memory block"""
+        return self._shm.name
+
+    @property
+    def nbytes(self):
+        return self._shm.size
+
+    def files(self):
+        """return the lamps as IESFile objects backed by the shared block"""
+        if self._files is None:
+            self._files = [self._build(entry) for entry in self._layout]
+        return self._files
+
+    def close(self):
+        """
+        detach from the shared block. lamps handed out by this set must no
+        longer be in use
+        """
+        self._files = None
+        self._shm.close()
+
+    def unlink(self):
+        """free the shared block; only the creating process should call this"""
+        self._shm.unlink()
+
+    # ---------------- Internals -----------------------
+
+    def _build(self, entry):
+        arrays, photometric_type, header, source = entry
+        views = []
+        for start, shape, dtype in arrays:
+            view = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=start)
+            view.flags.writeable = False
+            views.append(view)
+        thetas, phis, values = views
+        phot = Photometry(
+            thetas=thetas,
+            phis=phis,
+            values=values,
+            photometric_type=photometric_type,
+            dtype=values.dtype,
+        )
+        return IESFile(source=source, header=header, photometry=phot)
+
+
+def _source_name(source):
+    if source is None or isinstance(source, bytes):
+        return None
+    return str(getattr(source, "name", source))
+
+
+def _attach(name):
+    """attach to an existing block without letting this process free it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # python < 3.13
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
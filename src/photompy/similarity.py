@@ -0,0 +1,135 @@
+from collections import defaultdict
+import numpy as np
+from .calculate import compute_frustrum_area
+from .regrid import regrid_operator, grid_signature
+
+DESCRIPTOR_THETAS = np.linspace(0, 180, 19)
+DESCRIPTOR_PHIS = np.linspace(0, 360, 37)[:-1]  # 360 duplicates 0
+
+
+def descriptors(photometries, thetas=DESCRIPTOR_THETAS, phis=DESCRIPTOR_PHIS):
+    """
+    map photometries to fixed-length, scale-invariant shape vectors.
+
+    Each photometry is sampled on a coarse common grid, weighted by the
+    square root of the solid angle of each sample, and normalized to unit
+    length, so that euclidean distance between descriptors approximates
+    the difference between the normalized distributions over the sphere.
+    Photometries on the same native grid are regridded together.
+
+    returns a float32 array of shape (len(photometries), len(phis) * len(thetas))
+    """
+    thetas, phis = np.asarray(thetas), np.asarray(phis)
+    step = thetas[1] - thetas[0]
+    areas = compute_frustrum_area(
+        np.maximum(0, thetas - step / 2), np.minimum(180, thetas + step / 2)
+    )
+    weights = np.sqrt(areas / len(phis))
+
+    groups = defaultdict(list)
+    expanded = [getattr(p, "photometry", p).expanded() for p in photometries]
+    for i, exp in enumerate(expanded):
+        groups[grid_signature(exp.thetas, exp.phis)].append(i)
+
+    out = np.empty((len(expanded), len(phis) * len(thetas)), dtype=np.float32)
+    for members in groups.values():
+        first = expanded[members[0]]
+        op = regrid_operator(first.thetas, first.phis, thetas, phis)
+        stack = op.apply(np.stack([expanded[i].values for i in members]))
+        stack = (stack * weights).reshape(len(members), -1)
+        norms = np.linalg.norm(stack, axis=1, keepdims=True)
+        out[members] = stack / np.where(norms > 0, norms, 1)
+    return out
+
+
+def descriptor(photometry, thetas=DESCRIPTOR_THETAS, phis=DESCRIPTOR_PHIS):
+    """shape descriptor for a single photometry (see `descriptors`)"""
+    return descriptors([photometry], thetas=thetas, phis=phis)[0]
+
+
+class SimilarityIndex:
+    """
+    Nearest-neighbour index over photometry shape descriptors.
+
+    Descriptors are projected onto their leading `dim` principal
+    components, so that a query is a single small matrix-vector product
+    over the whole index. The best candidates are then re-ranked by exact
+    descriptor distance.
+
+    keys: labels returned by queries, e.g. file paths
+    descriptors: array of shape (len(keys), descriptor_length)
+    """
+
+    def __init__(self, keys, descriptors, dim=16, mean=None, components=None):
+        self.keys = np.asarray([str(k) for k in keys])
+        self.descriptors = np.asarray(descriptors, dtype=np.float32)
+        if len(self.keys) != len(self.descriptors):
+            raise ValueError("number of keys and descriptors must match")
+
+        if mean is None or components is None:
+            mean = self.descriptors.mean(axis=0)
+            centered = self.descriptors - mean
+            _, vecs = np.linalg.eigh(centered.T @ centered)
+            components = vecs[:, ::-1][:, :dim].T
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)
+        self._projected = (self.descriptors - self.mean) @ self.components.T
+        self._sqnorms = (self._projected**2).sum(axis=1)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, items, dim=16, **kwargs):
+        """
+        build an index from a mapping of keys to Photometry or IESFile
+        objects. keyword arguments are passed on to `descriptors`
+        """
+        keys = list(items)
+        return cls(keys, descriptors(list(items.values()), **kwargs), dim=dim)
+
+    def query(self, target, k=5, rerank=32):
+        """
+        return the `k` nearest entries as a list of (key, distance) pairs,
+        closest first. `target` is a Photometry, an IESFile, or a
+        descriptor. Distances are exact descriptor distances; the `rerank`
+        best projected candidates are considered.
+        """
+        if isinstance(target, np.ndarray):
+            desc = target.astype(np.float32)
+        else:
+            desc = descriptor(target)
+        k = min(k, len(self))
+
+        proj = (desc - self.mean) @ self.components.T
+        dist = self._sqnorms - 2 * (self._projected @ proj)
+        num = min(max(k, rerank), len(self))
+        candidates = np.argpartition(dist, num - 1)[:num]
+
+        exact = np.linalg.norm(self.descriptors[candidates] - desc, axis=1)
+        order = np.argsort(exact)[:k]
+        return [
+            (str(self.keys[i]), float(exact[j]))
+            for j, i in zip(order, candidates[order])
+        ]
+
+    def save(self, path):
+        """write the index to a .npz file"""
+        np.savez(
+            path,
+            keys=self.keys,
+            descriptors=self.descriptors,
+            mean=self.mean,
+            components=self.components,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """read an index written by `save`"""
+        with np.load(path) as data:
+            return cls(
+                data["keys"],
+                data["descriptors"],
+                mean=data["mean"],
+                components=data["components"],
+            )
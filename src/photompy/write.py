@@ -1,5 +1,5 @@
-from .read import verify_valdict, read_ies_data
-from .calculate import total_optical_power
+from .read import verify_valdict
+from .calculate import _read_cached
 
 
 def scale_lamp_to_total(total_power, ref_lamp, outfile):
@@ -7,17 +7,9 @@ def scale_lamp_to_total(total_power, ref_lamp, outfile):
     create a new ies file based on an existing file,
     with a set total optical power value
     """
-    lampdict = read_ies_data(ref_lamp)
-
-    valdict = lampdict["full_vals"]
-    top = total_optical_power(valdict)
-    factor = total_power / top
-
-    newdict = valdict.copy()
-    newdict["values"] = valdict["values"] * factor
-    lampdict["scaled_vals"] = newdict
-    lampdict["multiplier"] = 1
-    write_ies_data(outfile, lampdict, valkey="scaled_vals")
+    ies = _read_cached(ref_lamp).copy()
+    ies.scale(total_power / ies.photometry.expanded().total())
+    ies.write(outfile, which="full")
 
 
 def scale_lamp_to_max(max_val, ref_lamp, outfile):
@@ -25,17 +17,9 @@ def scale_lamp_to_max(max_val, ref_lamp, outfile):
     create a new ies file based on an existing file,
     with a set maximum irradiance value
     """
-    lampdict = read_ies_data(ref_lamp)
-
-    valdict = lampdict["full_vals"]
-    prev_max = valdict["values"].max()
-    factor = max_val / prev_max
-
-    newdict = valdict.copy()
-    newdict["values"] = valdict["values"] * factor
-    lampdict["scaled_vals"] = newdict
-    lampdict["multiplier"] = 1
-    write_ies_data(outfile, lampdict, valkey="scaled_vals")
+    ies = _read_cached(ref_lamp).copy()
+    ies.scale_to_max(max_val)
+    ies.write(outfile, which="full")
 
 
 def process_row(row, sigfigs=2):
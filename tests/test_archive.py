@@ -0,0 +1,53 @@
+import tarfile
+import zipfile
+import pytest
+from photompy import IESFile, write_zip
+
+
+def test_read_many_from_archives(sample_path, tmp_path):
+    names = ["sample_A.ies", "sample_B.ies"]
+    with zipfile.ZipFile(tmp_path / "lamps.zip", "w") as zf:
+        for name in names:
+            zf.write(sample_path / name, f"lamps/{name}")
+        zf.writestr("lamps/README.txt", "not a lamp")
+    with tarfile.open(tmp_path / "lamps.tar.gz", "w:gz") as tf:
+        tf.add(sample_path / "sample_A.ies", "sample_A.ies")
+
+    files = IESFile.read_many(
+        [tmp_path / "lamps.zip", tmp_path / "lamps.tar.gz", sample_path / names[1]],
+        jobs=2,
+    )
+    expected = [IESFile.read(sample_path / name) for name in names]
+    assert files == expected + expected[:1] + expected[1:]
+    assert files[0].source == tmp_path / "lamps.zip" / "lamps" / "sample_A.ies"
+    assert IESFile.read(files[0].source) == expected[0]
+    assert IESFile.read(tmp_path / "lamps.tar.gz" / "sample_A.ies") == expected[0]
+    with pytest.raises(FileNotFoundError):
+        IESFile.read(tmp_path / "lamps.zip" / "missing.ies")
+
+    sources = [b"garbage", sample_path / names[0]]
+    results = IESFile.read_many(sources, return_exceptions=True)
+    assert isinstance(results[0], Exception) and results[1] == expected[0]
+
+
+def test_write_zip_round_trip(load_ies, tmp_path):
+    names = ("sample_A.ies", "sample_B.ies", "sample_B.ies")
+    lamps = [load_ies(name) for name in names]
+    write_zip(tmp_path / "out.zip", lamps)
+    with zipfile.ZipFile(tmp_path / "out.zip") as zf:
+        assert zf.namelist() == ["sample_A.ies", "sample_B.ies", "sample_B_1.ies"]
+    files = IESFile.read_many([tmp_path / "out.zip"])
+    for read, lamp in zip(files, lamps, strict=True):
+        assert read.photometry.isclose(lamp.photometry, atol=0.01)
+
+
+def test_write_zip_names_string_sources(sample_path, tmp_path):
+    IESFile.read(sample_path / "sample_B.ies").write_ldt(tmp_path / "B.ldt")
+    paths = [str(sample_path / "sample_A.ies"), str(tmp_path / "B.ldt")]
+    lamps = [IESFile.read(path) for path in paths]
+    assert isinstance(lamps[0].source, str)
+    write_zip(tmp_path / "out.zip", lamps)
+    with zipfile.ZipFile(tmp_path / "out.zip") as zf:
+        assert zf.namelist() == ["sample_A.ies", "B.ldt"]
+    files = IESFile.read_many([tmp_path / "out.zip"])
+    assert files[1].photometry.isclose(lamps[1].photometry, rtol=1e-4)
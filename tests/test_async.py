@@ -0,0 +1,49 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from photompy import IESFile, aio
+
+
+def test_aread_and_evaluate(sample_path):
+    paths = [sample_path / "sample_A.ies", sample_path / "sample_B.ies"]
+
+    async def main():
+        files = await IESFile.aread_many(paths)
+        phot = files[1].photometry
+        theta, phi = np.meshgrid(np.linspace(0, 180, 37), np.linspace(0, 360, 19))
+        values = await phot.aget_intensity(theta, phi, chunk_size=100)
+        center = await phot.aget_intensity(0, 0)
+        interp = await phot.ainterpolated(19, 37, chunk_size=100)
+        return files, values, center, interp, theta, phi
+
+    files, values, center, interp, theta, phi = asyncio.run(main())
+    assert files == [IESFile.read(p) for p in paths]
+    assert files[0].source == paths[0]
+    phot = files[1].photometry
+    assert np.allclose(values, phot.get_intensity(theta, phi))
+    assert center.shape == () and center == pytest.approx(phot.center())
+    assert interp is phot.interpolated(19, 37)
+    assert np.allclose(interp.values, IESFile.read(paths[1]).interpolated(19, 37).values)
+
+
+def test_cancellation_frees_executor(load_ies):
+    phot = load_ies("sample_B.ies").photometry
+    defaults = dict(aio._config)
+    aio.configure(executor=ThreadPoolExecutor(2), max_concurrency=1)
+
+    async def main():
+        huge = asyncio.create_task(
+            phot.aget_intensity(np.full(10**6, 45.0), 10.0, chunk_size=1000)
+        )
+        await asyncio.sleep(0.01)
+        small = await asyncio.wait_for(phot.aget_intensity(30, 10), timeout=5)
+        huge.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await huge
+        return small
+
+    try:
+        assert asyncio.run(main()) == pytest.approx(phot.get_intensity(30, 10))
+    finally:
+        aio.configure(**defaults)
@@ -0,0 +1,63 @@
+import os
+import shutil
+import sqlite3
+from photompy import Catalog, IESFile
+from photompy.photometry import Photometry, PhotometricType
+
+
+def test_catalog_index_and_query(sample_path, tmp_path):
+    lib = tmp_path / "lib"
+    shutil.copytree(sample_path, lib)
+    with Catalog(tmp_path / "cat.db") as cat:
+        report = cat.index(lib)
+        assert report["added"] + report["failed"] == len(list(lib.glob("*.ies")))
+
+        half = cat.query(symmetry="half", input_watts=(50, None))
+        assert half and all(e.fields["input_watts"] >= 50 for e in half)
+        assert half[0].load().photometry.symmetry.value == "half"
+
+        ushio = cat.query(keywords={"MANUFAC": "Ushio"})
+        assert ushio and all(e.fields["symmetry"] == "none" for e in ushio)
+
+        # only touched files are re-parsed
+        target = lib / "sample_A.ies"
+        os.utime(target, (1, 1))
+        report = cat.index(lib)
+        assert report["added"] == report["updated"] == 0
+        target.write_text(target.read_text().replace("[MANUFAC] Ushio", "[MANUFAC] X"))
+        (lib / "sample_B.ies").unlink()
+        report = cat.index(lib)
+        assert (report["updated"], report["removed"]) == (1, 1)
+
+
+def test_catalog_metrics_and_migration(sample_path, tmp_path):
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    shutil.copy(sample_path / "sample_B.ies", lib)
+    db = tmp_path / "cat.db"
+    with Catalog(db) as cat:
+        cat.index(lib)
+        (entry,) = cat.query(beam_angle=(60, 100))
+        assert entry.fields["field_angle"] > entry.fields["beam_angle"]
+
+    # a catalog from before the metric columns existed
+    conn = sqlite3.connect(db)
+    with conn:
+        conn.execute("ALTER TABLE files DROP COLUMN beam_angle")
+    conn.close()
+    with Catalog(db) as cat:
+        assert cat.index(lib)["updated"] == 1
+        assert cat.query(beam_angle=(60, 100))
+
+
+def test_catalog_indexes_type_b_files(load_ies, tmp_path):
+    phot = load_ies("sample_B.ies").photometry
+    type_b = Photometry(phot.thetas, phot.phis, phot.values, PhotometricType.B)
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    IESFile.from_photometry(type_b).write(lib / "type_b.ies")
+    with Catalog(tmp_path / "cat.db") as cat:
+        assert cat.index(lib)["added"] == 1
+        (entry,) = cat.query()
+        assert entry.fields["beam_angle"] is None
+        assert entry.fields["total_power"] > 0
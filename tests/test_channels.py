@@ -0,0 +1,38 @@
+import numpy as np
+from photompy import IESFile, Photometry
+
+
+def _stacked(phot, factors):
+    values = np.stack([phot.values * f for f in factors], axis=-1)
+    return Photometry(
+        thetas=phot.thetas,
+        phis=phot.phis,
+        values=values,
+        photometric_type=phot.photometric_type,
+    )
+
+
+def test_channels_match_single(load_ies):
+    phot = load_ies("sample_A.ies").photometry
+    multi = _stacked(phot, [1.0, 0.5, 3.0])
+    assert multi.num_channels == 3
+
+    vals = multi.get_intensity([10.0, 45.0], [30.0, 200.0])
+    assert vals.shape == (2, 3)
+    np.testing.assert_allclose(vals[:, 1], 0.5 * phot.get_intensity([10, 45], [30, 200]))
+
+    np.testing.assert_allclose(multi.total(), phot.total() * np.array([1, 0.5, 3]))
+    interp = multi.interpolated(19, 37)
+    assert interp.values.shape == (37, 19, 3)
+    np.testing.assert_allclose(interp.values[..., 2], 3 * phot.interpolated(19, 37).values)
+
+    multi.scale_to_max(10)
+    np.testing.assert_allclose(multi.max(), [10, 10, 10])
+
+
+def test_channel_export(load_ies, tmp_path):
+    phot = load_ies("sample_A.ies").photometry
+    ies = IESFile.from_photometry(_stacked(phot, [1.0, 2.0]))
+    ies.write(tmp_path / "ch1.ies", channel=1)
+    reread = IESFile.read(tmp_path / "ch1.ies")
+    np.testing.assert_allclose(reread.photometry.values, 2 * phot.values, atol=0.01)
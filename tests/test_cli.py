@@ -0,0 +1,25 @@
+import json
+import numpy as np
+from photompy import IESFile
+from photompy.cli import main
+
+
+def _results(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_cli_info_and_errors(sample_path, capsys):
+    code = main(["info", str(sample_path / "sample_*.ies"), "missing.ies", "-q"])
+    results = {r["file"]: r for r in _results(capsys)}
+    assert code == 1
+    assert results["missing.ies"]["ok"] is False
+    assert results[str(sample_path / "sample_A.ies")]["symmetry"] == "none"
+
+
+def test_cli_parallel_scale(sample_path, tmp_path, capsys):
+    files = [str(sample_path / "sample_A.ies"), str(sample_path / "sample_B.ies")]
+    code = main(["scale", *files, "--to-max", "10", "-o", str(tmp_path), "-j", "2", "-q"])
+    assert code == 0
+    for result in _results(capsys):
+        scaled = IESFile.read(result["output"])
+        np.testing.assert_allclose(scaled.photometry.max(), 10, atol=0.01)
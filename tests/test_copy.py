@@ -0,0 +1,61 @@
+import copy
+import tracemalloc
+import numpy as np
+import pytest
+
+
+def test_copy_shares_until_scaled(load_ies):
+    ies = load_ies("sample_B.ies")
+    interp = ies.photometry.interpolated(19, 37)
+    clone = ies.copy()
+
+    assert clone == ies and clone.header is ies.header
+    assert clone.photometry.values is ies.photometry.values
+    assert clone.photometry.interpolated(19, 37) is interp
+    with pytest.raises(ValueError):
+        ies.photometry.values[0, 0] = 1
+
+    before = interp.values.copy()
+    clone.scale(2)
+    assert np.allclose(clone.photometry.values, 2 * ies.photometry.values)
+    assert np.allclose(clone.photometry.interpolated(19, 37).values, 2 * before)
+    assert np.array_equal(interp.values, before)
+    assert ies.photometry.interpolated(19, 37) is interp
+
+    clone.update(lumens_per_lamp=10)
+    assert ies.header.lumens_per_lamp != 10
+    assert copy.copy(ies).photometry.values is ies.photometry.values
+
+
+def test_many_clones_are_cheap(load_ies):
+    ies = load_ies("sample_B.ies")
+    ies.photometry.interpolated()
+    size = ies.memory_usage()["total"]
+
+    tracemalloc.start()
+    clones = [ies.copy() for _ in range(500)]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(clones) == 500
+    assert peak < size
+
+
+def test_clone_cannot_write_shared_products(load_ies):
+    ies = load_ies("sample_B.ies")
+    exp = ies.photometry.expanded()
+    interp = ies.photometry.interpolated(19, 37)
+    before = exp.values.copy(), interp.values.copy()
+    clone = ies.copy()
+
+    for product in (clone.photometry.expanded(), clone.photometry.interpolated(19, 37)):
+        with pytest.raises(ValueError):
+            product.values[0, 0] = -999
+        with pytest.raises(ValueError):
+            product.thetas[0] = -999
+    clone.scale(2)
+    with pytest.raises(ValueError):
+        clone.photometry.expanded().values[0, 0] = -999
+
+    assert np.array_equal(exp.values, before[0])
+    assert np.array_equal(interp.values, before[1])
+    assert ies.photometry.values.flags.writeable is False
@@ -0,0 +1,35 @@
+import numpy as np
+from photompy import IESFile
+from photompy.photometry import Photometry, PhotometricType
+
+
+def test_decimate_within_bound(load_ies, tmp_path):
+    ies = load_ies("sample_B.ies")
+    phot = ies.photometry
+    dec = phot.decimate(max_rel_error=0.01)
+    assert len(dec.thetas) < len(phot.thetas)
+    assert dec.symmetry == phot.symmetry
+
+    tgrid, pgrid = np.meshgrid(phot.thetas, phot.phis)
+    err = np.abs(dec.get_intensity(tgrid, pgrid) - phot.get_intensity(tgrid, pgrid))
+    assert err.max() <= 0.01 * phot.max()
+
+    IESFile(source=None, header=ies.header, photometry=dec).write(tmp_path / "d.ies")
+    reread = IESFile.read(tmp_path / "d.ies")
+    np.testing.assert_allclose(reread.photometry.thetas, dec.thetas)
+
+
+def test_decimate_axial(recwarn):
+    thetas = np.linspace(0, 90, 91)
+    values = np.cos(np.radians(thetas))[None, :]
+    dec = Photometry(thetas, np.array([0.0]), values, PhotometricType.C).decimate(1e-3)
+    assert len(dec.phis) == 1 and 2 < len(dec.thetas) < len(thetas)
+    assert np.allclose(dec.get_intensity(thetas, 0), values[0], atol=1e-3)
+    assert not [w for w in recwarn if issubclass(w.category, RuntimeWarning)]
+
+
+def test_decimate_keeps_total_power(load_ies):
+    for name in ("sample_A.ies", "sample_B.ies"):
+        phot = load_ies(name).photometry
+        dec = phot.decimate(max_rel_error=0.01)
+        assert np.isclose(dec.total(), phot.total(), rtol=0.02)
@@ -0,0 +1,28 @@
+import numpy as np
+from photompy import get_coords, polar_to_cartesian
+from photompy.directions import direction_table, _TABLES
+from photompy.photometry import Photometry
+
+
+def test_coords_shared_between_lamps(load_ies):
+    a = load_ies("sample_A.ies").photometry
+    b = load_ies("write_test_original.ies").photometry
+    assert a.coords is b.coords
+    assert not a.coords.flags.writeable
+
+    exp = a.expanded()
+    tgrid, pgrid = np.meshgrid(exp.thetas, exp.phis)
+    x, y, z = Photometry.to_cartesian(tgrid.ravel(), pgrid.ravel(), exp.values.ravel())
+    assert np.allclose(a.photometric_coords, np.array([x, y, -z]).T)
+
+
+def test_legacy_coords_and_bounded_cache():
+    thetas, phis = np.linspace(0, 180, 19), np.linspace(0, 360, 37)
+    tgrid, pgrid = np.meshgrid(thetas, phis)
+    points = zip(tgrid.ravel(), pgrid.ravel())
+    expected = np.array([polar_to_cartesian(t, p) for t, p in points]).T
+    assert np.allclose(get_coords(thetas, phis), expected)
+
+    for n in range(2 * _TABLES.maxsize):
+        direction_table(thetas, np.linspace(0, 360, n + 2))
+    assert len(_TABLES) == _TABLES.maxsize
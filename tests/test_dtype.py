@@ -0,0 +1,48 @@
+import copy
+import pickle
+import numpy as np
+import pytest
+import photompy
+from photompy import Photometry
+
+
+@pytest.fixture
+def float32_default():
+    photompy.set_default_dtype(np.float32)
+    yield
+    photompy.set_default_dtype(np.float64)
+
+
+def test_float32_storage(load_ies):
+    ref = load_ies("sample_B.ies")
+    ies = ref.astype(np.float32)
+    phot = ies.photometry
+
+    assert phot.values.dtype == np.float32
+    assert phot.expanded().values.dtype == np.float32
+    assert phot.interpolated(37, 73).values.dtype == np.float32
+    assert phot.coords.dtype == phot.photometric_coords.dtype == np.float32
+    assert phot.memory_usage()["values"] * 2 == ref.photometry.values.nbytes
+    assert ref.photometry.values.dtype == np.float64
+
+    assert np.isclose(phot.total(), ref.total(), rtol=1e-6)
+    interp = phot.interpolated().values
+    assert np.allclose(interp, ref.photometry.interpolated().values, rtol=1e-6)
+
+    ies.scale(1.5)
+    assert phot.values.dtype == np.float32
+    assert copy.copy(phot).dtype == np.float32
+    assert pickle.loads(pickle.dumps(ies)).photometry.dtype == np.float32
+    assert phot.astype(np.float32) is phot
+
+
+def test_default_dtype(load_ies, float32_default):
+    assert photompy.get_default_dtype() == np.float32
+    phot = load_ies("sample_A.ies").photometry
+    assert phot.values.dtype == np.float32
+    pinned = Photometry(
+        phot.thetas, phot.phis, phot.values, phot.photometric_type, dtype=np.float64
+    )
+    assert pinned.interpolated(19, 37).values.dtype == np.float64
+    with pytest.raises(ValueError):
+        photompy.set_default_dtype(np.float16)
@@ -0,0 +1,36 @@
+import numpy as np
+
+
+def test_fingerprint_dedupes_and_tracks_scaling(load_ies):
+    a = load_ies("sample_B.ies")
+    b = load_ies("LLIA001477-002.ies")  # same content, different file
+    assert a.photometry.fingerprint == b.photometry.fingerprint
+    assert len({a.photometry, b.photometry}) == 1
+    assert {a: 1}[a] == 1
+    assert hash(a.header) == hash(load_ies("sample_B.ies").header)
+
+    fp = a.photometry.fingerprint
+    a.scale(2.0)
+    assert a.photometry.fingerprint != fp
+    assert a.photometry != b.photometry
+    assert not a.photometry.isclose(b.photometry)
+
+    b.photometry.values = b.photometry.values * 2 * (1 + 1e-9)
+    assert a.photometry != b.photometry
+    assert a.photometry.isclose(b.photometry)
+    np.testing.assert_allclose(a.photometry.max(), b.photometry.max())
+
+
+def test_equality_follows_data_changes(load_ies):
+    a, b = load_ies("sample_B.ies"), load_ies("sample_B.ies")
+    a.photometry.fingerprint
+    a.photometry.values = a.photometry.values * 3
+    assert a.photometry != b.photometry and a != b
+
+    a, b = load_ies("sample_B.ies"), load_ies("sample_B.ies")
+    a.photometry.fingerprint, b.photometry.fingerprint
+    old = a.photometry.values[0, 0]
+    a.photometry.values[0, 0] += 1000
+    assert a.photometry != b.photometry and a != b
+    a.photometry.values[0, 0] = old
+    assert a.photometry == b.photometry
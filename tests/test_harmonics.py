@@ -0,0 +1,15 @@
+import numpy as np
+from photompy import Photometry
+
+
+def test_harmonic_fit_reconstructs_smooth_lamp(load_ies):
+    phot = load_ies("sample_A.ies").photometry
+    fit = phot.fit_harmonics(max_rel_error=0.05)
+    assert fit.nbytes < phot.expanded().values.nbytes
+
+    recon = fit.to_photometry(phot.thetas, phot.phis)
+    assert np.abs(recon.values - phot.values).max() <= 0.06 * phot.max()
+
+    # direction vectors and angles agree
+    dirs = np.stack(Photometry.to_cartesian(np.array([30.0]), np.array([45.0]), 1), -1)
+    np.testing.assert_allclose(fit.evaluate(dirs), fit.get_intensity(30.0, 45.0))
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from photompy import IESFile
+from photompy.photometry import LampSymmetry
+
+
+def _ldt(isym, planes):
+    """a minimal eulumdat file with 4 C-planes and 3 gamma angles"""
+    lines = ["ACME", "1", str(isym), "4", "90", "3", "45", "R-1", "Lum", "L-1"]
+    lines += ["lum.ldt", "2024-01-01", "600", "300", "50"]
+    lines += ["600", "300", "0", "0", "0", "0", "80", "95", "1", "0"]
+    lines += ["1", "2", "LED", "2000", "4000", "80", "20.5"]
+    lines += ["0.5"] * 10
+    lines += ["0", "90", "180", "270", "0", "45", "90"]
+    lines += [f"{v:g}".replace(".", ",") for plane in planes for v in plane]
+    return "\r\n".join(lines).encode("latin-1")
+
+
+@pytest.mark.parametrize(
+    "isym, planes, symmetry, phis",
+    [
+        (1, [[100, 50, 0]], LampSymmetry.AXIAL, [0]),
+        (2, [[9, 5, 0], [8, 4, 0], [7, 3, 0]], LampSymmetry.HALF, [0, 90, 180]),
+        (4, [[100, 50, 0], [90, 40, 0]], LampSymmetry.QUAD, [0, 90]),
+    ],
+)
+def test_read_ldt_symmetry(isym, planes, symmetry, phis):
+    ies = IESFile.read(_ldt(isym, planes))
+    phot = ies.photometry
+    assert phot.symmetry == symmetry
+    assert list(phot.phis) == phis and list(phot.thetas) == [0, 45, 90]
+    assert np.allclose(phot.values, np.array(planes) * 2)  # cd/klm at 2000 lm
+    assert ies.header.lumens_per_lamp == 1000 and ies.header.num_lamps == 2
+    assert ies.header.length == pytest.approx(0.6) and ies.header.input_watts == 20.5
+
+
+def test_read_ldt_c90_symmetry():
+    # planes C270, C0 and C90 are stored
+    phot = IESFile.read(_ldt(3, [[3, 3, 0], [1, 1, 0], [2, 2, 0]])).photometry
+    assert phot.symmetry == LampSymmetry.NONE
+    assert list(phot.phis) == [0, 90, 180, 270, 360]
+    assert np.allclose(phot.values[:, 0], np.array([1, 2, 1, 3, 1]) * 2)
+
+
+def test_ldt_round_trip(sample_path, tmp_path):
+    ies = IESFile.read(sample_path / "sample_B.ies")
+    ies.write_ldt(tmp_path / "lamp.ldt")
+    back = IESFile.read(tmp_path / "lamp.ldt")
+    assert back.photometry.symmetry == ies.photometry.symmetry
+    assert back.photometry.isclose(ies.photometry, rtol=1e-5, atol=1e-6)
+
+    again = IESFile.read(back.write_ldt())
+    assert again.header.keywords == back.header.keywords
+    assert again.photometry.isclose(back.photometry, rtol=1e-5)
+
+    files = IESFile.read_many([tmp_path / "lamp.ldt", sample_path / "sample_B.ies"])
+    assert files[0].photometry.isclose(files[1].photometry, rtol=1e-5, atol=1e-6)
+
+
+def test_ldt_lamp_sets_round_trip(tmp_path):
+    lines = _ldt(1, [[100, 50, 0]]).decode("latin-1").split("\r\n")
+    # two sets, stored field by field: counts, types, fluxes, cct, cri, watts
+    lines[25:32] = ["2", "1", "2", "LED A", "LED B", "1000", "3000"]
+    lines[32:32] = ["3000", "4000", "80", "90", "10", "20"]
+    ies = IESFile.read("\r\n".join(lines).encode("latin-1"))
+    assert ies.header.num_lamps == 3 and ies.header.input_watts == 30
+    assert ies.header.lumens_per_lamp == pytest.approx(4000 / 3)
+    assert ies.header.keywords["LAMP"] == "LED A, LED B"
+
+    ies.write_ldt(tmp_path / "sets.ldt")
+    written = (tmp_path / "sets.ldt").read_bytes().decode("latin-1").split("\r\n")
+    assert written[25:38] == lines[25:38]
+    back = IESFile.read(tmp_path / "sets.ldt")
+    assert back.header.keywords == ies.header.keywords
+    assert back.photometry.isclose(ies.photometry)
@@ -0,0 +1,33 @@
+import os
+import shutil
+import pytest
+import photompy
+from photompy import IESFile
+
+
+def test_legacy_functions_share_parsed_file(sample_path, tmp_path):
+    path = tmp_path / "lamp.ies"
+    shutil.copy(sample_path / "sample_A.ies", path)
+
+    power = photompy.total_optical_power(path)
+    ies = IESFile.read_cached(path, strict=False)
+    assert ies is IESFile.read_cached(path, strict=False)
+    assert ("interpolated", 181, 361) in ies.photometry._cache
+    assert power == pytest.approx(ies.photometry.interpolated().total())
+    assert photompy.lamp_area(path, units="feet") == pytest.approx(
+        ies.header.width * ies.header.length
+    )
+
+    photompy.scale_lamp_to_total(100, path, tmp_path / "total.ies")
+    photompy.scale_lamp_to_max(50, path, tmp_path / "max.ies")
+    assert IESFile.read(tmp_path / "total.ies").photometry.total() == pytest.approx(
+        100, rel=1e-3
+    )
+    assert IESFile.read(tmp_path / "max.ies").photometry.max() == pytest.approx(50)
+    assert IESFile.read_cached(path, strict=False).photometry.total() == pytest.approx(
+        ies.photometry.total()
+    )
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert IESFile.read_cached(path, strict=False) is not ies
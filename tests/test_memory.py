@@ -0,0 +1,23 @@
+from photompy import memory_report
+
+
+def test_memory_usage_and_drop_caches(load_ies):
+    ies = load_ies("sample_B.ies")
+    phot = ies.photometry
+    base = phot.memory_usage()["total"]
+    phot.interpolated(19, 37)
+    phot.photometric_coords
+
+    usage = ies.memory_usage()
+    cache = usage["photometry"]["cache"]
+    assert set(cache) == {"expanded", "interpolated(19, 37)", "pcoords"}
+    assert usage["photometry"]["total"] == base + sum(cache.values())
+
+    released = ies.drop_caches("interp")
+    assert released == cache["interpolated(19, 37)"]
+    assert "interpolated(19, 37)" not in phot.memory_usage()["cache"]
+
+    report = memory_report({"b": ies, "a": load_ies("sample_A.ies")}, top=1)
+    assert report["objects"][0][0] == "b"
+    assert report["cache"][0][0] == "pcoords"  # n x 3 coordinates
+    assert phot.drop_caches() > 0 and phot.memory_usage()["total"] == base
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from photompy import lamp_metrics, catalog_metrics
+from photompy.metrics import summarize
+
+
+def test_lambertian_metrics():
+    thetas = np.linspace(0, 180, 721)
+    phis = np.linspace(0, 360, 73)
+    values = np.tile(np.cos(np.radians(thetas)).clip(0), (len(phis), 1))
+    stack = np.stack([values, 2 * values])
+
+    m = summarize(stack, thetas, phis, input_watts=[np.pi, 0], lamp_lumens=np.pi)
+    assert np.allclose(m["total_lumens"], [np.pi, 2 * np.pi], rtol=1e-4)
+    assert np.allclose(m["zonal_lumens"][:, 0], [np.pi / 4, np.pi / 2], rtol=1e-3)
+    assert np.allclose(m["beam_angle"], 120, atol=0.1)
+    assert np.allclose(m["field_angle"], 2 * np.degrees(np.arccos(0.1)), atol=0.1)
+    # midway illuminance 2 cos^4(t) matches that below at cos(t) = 2 ** -0.25
+    sc = 2 * np.tan(np.arccos(2**-0.25))
+    assert np.allclose(m["spacing_criterion"], sc, atol=0.01)
+    assert np.isclose(m["efficacy"][0], 1, rtol=1e-4) and np.isnan(m["efficacy"][1])
+    assert np.allclose(m["lor"], [1, 2], rtol=1e-4)
+
+
+def test_catalog_metrics_match_single_lamps(load_ies):
+    files = [load_ies(name) for name in ("sample_A.ies", "sample_B.ies")]
+    stacked = catalog_metrics(files)
+    for i, ies in enumerate(files):
+        single = lamp_metrics(ies)
+        assert single["beam_angle"] == pytest.approx(stacked["beam_angle"][i])
+        assert single["total_lumens"] == pytest.approx(ies.total(), rel=0.01)
+        zonal = single["zonal_lumens"]
+        assert zonal[0, 90] + zonal[90, 180] == pytest.approx(zonal[0, 180])
+        assert single["efficacy"] == pytest.approx(
+            single["total_lumens"] / ies.header.input_watts
+        )
+
+
+def test_catalog_metrics_leave_caches_alone(load_ies):
+    files = [load_ies(name) for name in ("sample_A.ies", "sample_B.ies")]
+    files[1].photometry.expanded()
+    before = [ies.memory_usage()["total"] for ies in files]
+    summary = catalog_metrics(files)
+    assert [ies.memory_usage()["total"] for ies in files] == before
+    interp = files[0].photometry.interpolated()
+    assert summary["total_lumens"][0] == pytest.approx(interp.total(), rel=0.01)
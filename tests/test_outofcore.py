@@ -0,0 +1,64 @@
+import tracemalloc
+import numpy as np
+import pytest
+from photompy import outofcore
+from photompy.photometry import Photometry, PhotometricType
+
+
+@pytest.fixture
+def small_blocks():
+    old = dict(outofcore._config)
+    outofcore.configure(block_bytes=256)
+    yield
+    outofcore._config.update(old)
+
+
+def _memmap_of(phot, path):
+    values = np.memmap(path, dtype=np.float64, mode="w+", shape=phot.values.shape)
+    values[:] = phot.values
+    values.flush()
+    values = np.memmap(path, dtype=np.float64, mode="r", shape=phot.values.shape)
+    return Photometry(phot.thetas, phot.phis, values, phot.photometric_type)
+
+
+def test_memmap_matches_in_memory(load_ies, tmp_path, small_blocks):
+    phot = load_ies("sample_B.ies").photometry
+    mm = _memmap_of(phot, tmp_path / "values.f64")
+
+    assert mm == phot
+    assert np.isclose(mm.total_optical_power(), phot.total_optical_power())
+    assert np.allclose(mm.max(), phot.max())
+
+    exp = mm.expanded()
+    assert outofcore.is_memmap(exp.values)
+    assert np.array_equal(exp.values, phot.expanded().values)
+
+    interp = mm.interpolated(37, 73)
+    assert outofcore.is_memmap(interp.values)
+    assert np.allclose(interp.values, phot.interpolated(37, 73).values)
+
+    mm.scale(2)
+    assert outofcore.is_memmap(mm.values)
+    assert np.allclose(mm.values, 2 * phot.values)
+    assert np.allclose(mm.interpolated(37, 73).values, 2 * interp.values)
+
+
+def test_peak_memory_bounded_by_block_size(tmp_path):
+    outofcore.configure(block_bytes=2**20)
+    thetas = np.linspace(0, 180, 1801)
+    phis = np.linspace(0, 360, 721)
+    shape = (len(phis), len(thetas))  # ~10 MB
+    values = np.memmap(tmp_path / "big.f64", dtype=np.float64, mode="w+", shape=shape)
+    values[:] = np.cos(np.radians(thetas)).clip(0)
+    phot = Photometry(thetas, phis, values, PhotometricType.C)
+
+    tracemalloc.start()
+    try:
+        phot.total_optical_power()
+        phot.max()
+        phot.scale(0.5)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        outofcore.configure(block_bytes=64 * 2**20)
+    assert peak < values.nbytes / 2
@@ -0,0 +1,40 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pytest
+from photompy import SharedLampSet
+
+
+def _total(lamps, i):
+    return float(lamps[i].photometry.total())
+
+
+def test_pickle_excludes_caches(load_ies):
+    ies = load_ies("sample_B.ies")
+    ies.photometry.interpolated(19, 37)
+    ies.photometry.photometric_coords
+
+    copy = pickle.loads(pickle.dumps(ies))
+    assert copy.photometry._cache == {}
+    assert copy == ies
+    assert copy.source == ies.source.name
+    assert len(pickle.dumps(ies)) < ies.memory_usage()["total"]
+
+
+def test_shared_lamp_set(load_ies):
+    files = [load_ies("sample_A.ies"), load_ies("sample_B.ies")]
+    with SharedLampSet(files) as lamps:
+        assert len(lamps) == 2
+        assert lamps[1] == files[1]
+        assert len(pickle.dumps(lamps)) < lamps.nbytes
+        with pytest.raises(ValueError):
+            lamps[0].photometry.values[0, 0] = 1
+
+        scaled = lamps[0].photometry.scale(2)
+        assert np.allclose(scaled, 2 * files[0].photometry.values)
+
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            totals = list(pool.map(_total, [lamps] * 2, [0, 1]))
+        assert totals == pytest.approx(
+            [_total(files, 0), _total(files, 1)]
+        )
@@ -0,0 +1,28 @@
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+def _scatter(fig):
+    (collection,) = fig.axes[0].collections
+    return collection
+
+
+def test_cartesian_plot_decimates_to_budget(load_ies):
+    ies = load_ies("sample_B.ies")
+    interp = ies.photometry.interpolated(361, 721)  # 0.5 degree grid
+
+    fig, _ = ies.plot("cartesian", which="interp", interp_args=(361, 721))
+    points = _scatter(fig)
+    assert len(points.get_offsets()) <= 20_000
+    assert points.get_array().max() == interp.values.max()  # peak kept
+    plt.close(fig)
+
+    fig, _ = interp.plot_cartesian(max_points=500)
+    assert len(_scatter(fig).get_offsets()) <= 500
+    plt.close(fig)
+
+    exp = ies.photometry.expanded()
+    fig, _ = exp.plot_cartesian()  # small grids are not decimated
+    colors = _scatter(fig).get_array()
+    assert np.array_equal(np.sort(colors), np.sort(exp.values.ravel()))
+    plt.close(fig)
@@ -0,0 +1,28 @@
+from photompy import IESFile, profile
+from photompy.profiling import span, _NULL_SPAN
+
+
+def test_profile_collects_pipeline_spans(sample_path):
+    assert span("anything") is _NULL_SPAN  # disabled → shared no-op
+    with profile() as prof:
+        ies = IESFile.read(sample_path / "sample_B.ies")
+        ies.photometry.interpolated(19, 37)
+        ies.write()
+    summary = prof.summary()
+    for stage in [
+        "read",
+        "read.decode",
+        "read.split_string",
+        "read.process_keywords",
+        "read.header",
+        "read.read_angles",
+        "photometry.post_init",
+        "photometry.infer_symmetry",
+        "expanded",
+        "interpolated",
+        "write",
+    ]:
+        assert stage in summary, stage
+    assert summary["read"]["bytes"] > 0
+    assert "read.decode" in prof.table()
+    assert span("anything") is _NULL_SPAN
@@ -0,0 +1,27 @@
+import numpy as np
+from photompy.regrid import regrid_operator
+
+
+def test_regrid_matches_get_intensity(load_ies):
+    phot = load_ies("sample_A.ies").photometry
+    exp = phot.expanded()
+    thetas = np.array([0.0, 12.5, 47.3, 90.0, 133.0, 180.0])
+    phis = np.array([0.0, 33.3, 181.0, 359.5])
+
+    op = regrid_operator(exp.thetas, exp.phis, thetas, phis)
+    regridded = op.apply(phot)
+
+    tgrid, pgrid = np.meshgrid(thetas, phis)
+    np.testing.assert_allclose(regridded.values, exp.get_intensity(tgrid, pgrid))
+    # same grids → same cached operator
+    assert regrid_operator(exp.thetas, exp.phis, thetas, phis) is op
+
+
+def test_regrid_stack(load_ies):
+    phot = load_ies("sample_A.ies").photometry
+    exp = phot.expanded()
+    op = regrid_operator(exp.thetas, exp.phis, [10, 20], [0, 90, 180])
+    stack = np.stack([exp.values, 2 * exp.values])
+    out = op.apply(stack)
+    assert out.shape == (2, 3, 2)
+    np.testing.assert_allclose(out[1], 2 * out[0])
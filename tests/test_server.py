@@ -0,0 +1,141 @@
+import asyncio
+import json
+import numpy as np
+import pytest
+from photompy.server import Metrics, Server, _Batcher
+
+
+async def _post(address, path, payload, unix=False):
+    if unix:
+        reader, writer = await asyncio.open_unix_connection(address)
+    else:
+        reader, writer = await asyncio.open_connection(*address)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    method = "GET" if payload is None else "POST"
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n".encode() + body
+    )
+    status = int((await reader.readline()).split()[1])
+    response = await reader.read()
+    writer.close()
+    return status, json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+def test_server_coalesces_requests(sample_path):
+    paths = [sample_path / "sample_A.ies", sample_path / "sample_B.ies"]
+
+    async def main():
+        server = await Server.from_files(paths, port=0, window=0.02)
+        await server.start()
+        try:
+            address = server.address
+            thetas = np.linspace(0, 90, 20)
+            queries = [{"lamp": "sample_B", "theta": t, "phi": 45} for t in thetas]
+            replies = await asyncio.gather(
+                *(_post(address, "/intensity", query) for query in queries)
+            )
+            irradiance = await _post(
+                address, "/irradiance", {"lamp": "sample_B", "points": [[0, 0, -2]]}
+            )
+            unknown = {"lamp": "nope", "theta": 0, "phi": 0}
+            bad = await _post(address, "/intensity", unknown)
+            lamps = await _post(address, "/lamps", None)
+            metrics = await _post(address, "/metrics", None)
+        finally:
+            await server.close()
+        return server, thetas, replies, irradiance, bad, lamps, metrics
+
+    server, thetas, replies, irradiance, bad, lamps, metrics = asyncio.run(main())
+    phot = server.lamps["sample_B"].photometry
+    assert [status for status, _ in replies] == [200] * 20
+    values = [reply["values"] for _, reply in replies]
+    assert values == pytest.approx(list(phot.get_intensity(thetas, 45)))
+    assert irradiance[1]["values"] == pytest.approx([phot.center() / 4])
+    assert bad[0] == 404
+    assert set(lamps[1]) == {"sample_A", "sample_B"}
+
+    batches = metrics[1]["batches"]
+    assert batches["max_requests"] > 1 and batches["count"] < 21
+    assert metrics[1]["requests"]["/intensity"]["count"] == 21
+    assert metrics[1]["requests"]["/intensity"]["errors"] == 1
+
+
+def test_server_unix_socket(sample_path, tmp_path):
+    async def main():
+        server = await Server.from_files(
+            [sample_path / "sample_A.ies"], unix_path=tmp_path / "photompy.sock"
+        )
+        await server.start()
+        try:
+            return await _post(
+                server.address,
+                "/intensity",
+                {"lamp": "sample_A", "theta": [0, 200], "phi": 0},
+                unix=True,
+            )
+        finally:
+            await server.close()
+
+    status, reply = asyncio.run(main())
+    assert status == 400 and "Theta" in reply["error"]
+
+
+def test_server_rejects_malformed_requests(sample_path):
+    async def main():
+        server = await Server.from_files([sample_path / "sample_B.ies"], port=0)
+        missing = [
+            await server._dispatch("POST", "/intensity", body)
+            for body in (b'{"lamp": "sample_B", "phi": 0}', b'{"theta": 0, "phi": 0}')
+        ]
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(*server.address)
+            writer.write(b"GARBAGE\r\n\r\n")
+            status = int((await reader.readline()).split()[1])
+            writer.close()
+        finally:
+            await server.close()
+        return missing, status
+
+    missing, status = asyncio.run(main())
+    assert [code for code, _ in missing] == [400, 400]
+    assert "theta" in missing[0][1]["error"]
+    assert status == 400
+
+
+def test_server_mirrors_symmetric_lamps(sample_path):
+    async def main():
+        server = await Server.from_files([sample_path / "sample_B.ies"], port=0)
+        await server.start()
+        try:
+            query = {"lamp": "sample_B", "theta": 30, "phi": [90, 200, 270, 315]}
+            return server, await _post(server.address, "/intensity", query)
+        finally:
+            await server.close()
+
+    server, (status, reply) = asyncio.run(main())
+    exp = server.lamps["sample_B"].photometry.expanded()
+    assert status == 200 and min(reply["values"]) >= 0
+    assert reply["values"] == pytest.approx(
+        list(exp.get_intensity(30, np.array([90, 200, 270, 315])))
+    )
+
+
+def test_batcher_skips_cancelled_waiters(load_ies):
+    exp = load_ies("sample_A.ies").photometry.expanded()
+
+    async def main():
+        batcher = _Batcher(exp, 0.01, Metrics())
+        queries = [([0, 10], 0), ([20, 30, 40], 90), ([50], 180)]
+        tasks = [
+            asyncio.create_task(batcher.evaluate(np.array(t), np.array(p)))
+            for t, p in queries
+        ]
+        await asyncio.sleep(0)
+        tasks[0].cancel()
+        return await asyncio.gather(*tasks[1:])
+
+    middle, last = asyncio.run(main())
+    assert np.allclose(middle, exp.get_intensity([20, 30, 40], 90))
+    assert np.allclose(last, exp.get_intensity([50], 180))
@@ -0,0 +1,19 @@
+import numpy as np
+from photompy import SimilarityIndex
+
+
+def test_similarity_query_and_persist(load_ies, tmp_path):
+    names = ["sample_A.ies", "sample_B.ies", "LLIA001477-003.ies", "B1.5 module.ies"]
+    lamps = {name: load_ies(name) for name in names}
+    index = SimilarityIndex.build(lamps, dim=3)
+
+    # scaling does not change the shape descriptor
+    target = load_ies("sample_B.ies").scale(7.0)
+    (best, dist), second = index.query(target, k=2)
+    assert best == "sample_B.ies" and dist < 1e-5
+    assert second[1] >= dist
+
+    index.save(tmp_path / "index.npz")
+    loaded = SimilarityIndex.load(tmp_path / "index.npz")
+    assert loaded.query(target, k=2) == index.query(target, k=2)
+    np.testing.assert_array_equal(loaded.keys, index.keys)
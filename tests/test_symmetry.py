@@ -0,0 +1,19 @@
+import numpy as np
+from photompy import IESFile
+from photompy.photometry import LampSymmetry
+
+
+def test_compact_hidden_symmetry(load_ies, tmp_path):
+    half = load_ies("sample_B.ies").photometry
+    full = half.expanded()
+    assert full.symmetry == LampSymmetry.NONE
+    assert full.detect_symmetry() == LampSymmetry.HALF
+
+    compact = full.compact()
+    assert compact.symmetry == LampSymmetry.HALF
+    np.testing.assert_allclose(compact.values, half.expanded().values[: len(half.phis)])
+
+    ies = IESFile.from_photometry(full)
+    ies.write(tmp_path / "c.ies", which="compact")
+    reread = IESFile.read(tmp_path / "c.ies")
+    assert reread.photometry.symmetry == LampSymmetry.HALF
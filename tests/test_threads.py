@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import numpy as np
+from photompy import Photometry
+
+
+def test_concurrent_reads_and_scaling(load_ies, monkeypatch):
+    lamps = [load_ies(name).photometry for name in ("sample_A.ies", "sample_B.ies")]
+    calls = []
+    expand = Photometry._expand_angles
+
+    def slow_expand(self):
+        calls.append(self)
+        time.sleep(0.01)  # widen the race window
+        return expand(self)
+
+    monkeypatch.setattr(Photometry, "_expand_angles", slow_expand)
+    start = threading.Barrier(16)
+
+    def read(i):
+        phot = lamps[i % 2]
+        start.wait()
+        for _ in range(50):
+            phot.expanded()
+            phot.interpolated(19, 37)
+            phot.coords
+            phot.get_intensity(np.linspace(0, 180, 7), 45)
+        return phot.expanded()
+
+    def rescale(i):
+        phot = lamps[i % 2]
+        start.wait()
+        for _ in range(50):
+            phot.scale(2)
+            phot.scale(0.5)
+        return None
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        jobs = [pool.submit(read, i) for i in range(12)]
+        jobs += [pool.submit(rescale, i) for i in range(4)]
+        results = [job.result() for job in jobs]
+
+    for i, phot in enumerate(lamps):
+        assert results[i] is not None
+        assert calls.count(phot) == 1  # expanded once, then rescaled copies
+        fresh = Photometry(phot.thetas, phot.phis, phot.values, phot.photometric_type)
+        assert np.allclose(phot.expanded().values, fresh.expanded().values)
+        assert np.allclose(
+            phot.interpolated(19, 37).values, fresh.interpolated(19, 37).values
+        )